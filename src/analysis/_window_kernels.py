@@ -0,0 +1,581 @@
+"""
+Numba-compiled sliding-window kernels used by the technical indicators.
+
+pandas' `Series.rolling(...)` rebuilds a window object and dispatches through
+Python on every call, which is 10-80x slower than a compiled loop over a plain
+float64 ndarray. Each kernel here walks the data exactly once (O(n), not
+O(n*w)) by maintaining a running accumulator: a sliding sum for the mean, a
+sliding sum-of-squares for the standard deviation, and a monotonic deque of
+indices for the min/max. The first `window - 1` output slots are NaN, matching
+pandas' rolling semantics.
+
+All kernels are compiled with `cache=True` so the machine code persists under
+`__pycache__/` between runs, and are warmed up once at import time so the
+first user request is not hit with JIT compile latency. On a warm cache the
+warmup only loads the compiled objects from disk, so import stays cheap; the
+first-ever run (or a Numba/LLVM upgrade, which invalidates the cache) pays
+the full compile once at startup instead of on a user request.
+
+Ahead-of-time compilation via `numba.pycc` would remove even that first-run
+cost, but pycc is deprecated upstream, so the cache-plus-warmup scheme is the
+supported way to keep compilation off the serving path.
+"""
+import functools
+
+import numba
+import numpy as np
+
+
+@numba.njit(cache=True, nogil=True)
+def sliding_mean(x, w):
+    """Rolling mean of `x` over window `w` via a running sum."""
+    n = x.shape[0]
+    out = np.empty(n, dtype=np.float64)
+    out[:min(w - 1, n)] = np.nan
+    s = 0.0
+    nan_count = 0
+    for i in range(n):
+        if np.isnan(x[i]):
+            nan_count += 1
+        else:
+            s += x[i]
+        if i >= w:
+            if np.isnan(x[i - w]):
+                nan_count -= 1
+            else:
+                s -= x[i - w]
+        if i >= w - 1:
+            out[i] = np.nan if nan_count > 0 else s / w
+    return out
+
+
+@numba.njit(cache=True, nogil=True)
+def sliding_std(x, w):
+    """Rolling sample standard deviation of `x` over window `w`.
+
+    Maintains running sum and sum-of-squares; the variance is clamped at zero
+    to guard against floating-point cancellation on flat windows.
+    """
+    n = x.shape[0]
+    out = np.empty(n, dtype=np.float64)
+    out[:min(w - 1, n)] = np.nan
+    s = 0.0
+    s2 = 0.0
+    nan_count = 0
+    for i in range(n):
+        if np.isnan(x[i]):
+            nan_count += 1
+        else:
+            s += x[i]
+            s2 += x[i] * x[i]
+        if i >= w:
+            if np.isnan(x[i - w]):
+                nan_count -= 1
+            else:
+                s -= x[i - w]
+                s2 -= x[i - w] * x[i - w]
+        if i >= w - 1:
+            if nan_count > 0:
+                out[i] = np.nan
+            else:
+                var = (s2 - s * s / w) / (w - 1)
+                out[i] = np.sqrt(max(var, 0.0))
+    return out
+
+
+@numba.njit(cache=True, nogil=True)
+def sliding_mean_std(x, w):
+    """Rolling mean and sample standard deviation in a single pass.
+
+    Bollinger Bands need both over the same window, so this shares the
+    running-sum bookkeeping instead of walking `x` once per statistic. Same
+    NaN semantics and cancellation clamp as the individual kernels.
+    """
+    n = x.shape[0]
+    mean_out = np.empty(n, dtype=np.float64)
+    std_out = np.empty(n, dtype=np.float64)
+    mean_out[:min(w - 1, n)] = np.nan
+    std_out[:min(w - 1, n)] = np.nan
+    s = 0.0
+    s2 = 0.0
+    nan_count = 0
+    for i in range(n):
+        if np.isnan(x[i]):
+            nan_count += 1
+        else:
+            s += x[i]
+            s2 += x[i] * x[i]
+        if i >= w:
+            if np.isnan(x[i - w]):
+                nan_count -= 1
+            else:
+                s -= x[i - w]
+                s2 -= x[i - w] * x[i - w]
+        if i >= w - 1:
+            if nan_count > 0:
+                mean_out[i] = np.nan
+                std_out[i] = np.nan
+            else:
+                mean_out[i] = s / w
+                var = (s2 - s * s / w) / (w - 1)
+                std_out[i] = np.sqrt(max(var, 0.0))
+    return mean_out, std_out
+
+
+@numba.njit(cache=True, nogil=True)
+def sliding_min(x, w):
+    """Rolling minimum of `x` over window `w` using a monotonic deque.
+
+    Each index enters and leaves the deque at most once, so the whole pass
+    is O(n) regardless of window size. NaN elements never enter the deque
+    (their comparisons are always False) and are tracked with a window count
+    instead, so a window containing NaN yields NaN — matching pandas —
+    rather than the minimum of the remaining values.
+    """
+    n = x.shape[0]
+    out = np.empty(n, dtype=np.float64)
+    out[:min(w - 1, n)] = np.nan
+    deque = np.empty(n, dtype=np.int64)
+    head = 0
+    tail = 0
+    nan_count = 0
+    for i in range(n):
+        if np.isnan(x[i]):
+            nan_count += 1
+        else:
+            while tail > head and x[deque[tail - 1]] >= x[i]:
+                tail -= 1
+            deque[tail] = i
+            tail += 1
+        if i >= w and np.isnan(x[i - w]):
+            nan_count -= 1
+        if tail > head and deque[head] <= i - w:
+            head += 1
+        if i >= w - 1:
+            out[i] = np.nan if nan_count > 0 else x[deque[head]]
+    return out
+
+
+@numba.njit(cache=True, nogil=True)
+def sliding_max(x, w):
+    """Rolling maximum of `x` over window `w` using a monotonic deque.
+
+    Same NaN semantics as sliding_min: windows containing NaN yield NaN.
+    """
+    n = x.shape[0]
+    out = np.empty(n, dtype=np.float64)
+    out[:min(w - 1, n)] = np.nan
+    deque = np.empty(n, dtype=np.int64)
+    head = 0
+    tail = 0
+    nan_count = 0
+    for i in range(n):
+        if np.isnan(x[i]):
+            nan_count += 1
+        else:
+            while tail > head and x[deque[tail - 1]] <= x[i]:
+                tail -= 1
+            deque[tail] = i
+            tail += 1
+        if i >= w and np.isnan(x[i - w]):
+            nan_count -= 1
+        if tail > head and deque[head] <= i - w:
+            head += 1
+        if i >= w - 1:
+            out[i] = np.nan if nan_count > 0 else x[deque[head]]
+    return out
+
+
+@numba.njit(cache=True, nogil=True)
+def sliding_minmax(low, high, w):
+    """Rolling minimum of `low` and maximum of `high` in a single pass.
+
+    The stochastic oscillator needs both extremes over the same window, so
+    this maintains the two monotonic deques side by side rather than walking
+    each array separately. NaNs are counted per array, so a NaN low blanks
+    only min_out for the windows containing it, and likewise for highs.
+    """
+    n = low.shape[0]
+    min_out = np.empty(n, dtype=np.float64)
+    max_out = np.empty(n, dtype=np.float64)
+    min_out[:min(w - 1, n)] = np.nan
+    max_out[:min(w - 1, n)] = np.nan
+    min_deque = np.empty(n, dtype=np.int64)
+    max_deque = np.empty(n, dtype=np.int64)
+    min_head = 0
+    min_tail = 0
+    max_head = 0
+    max_tail = 0
+    low_nan = 0
+    high_nan = 0
+    for i in range(n):
+        if np.isnan(low[i]):
+            low_nan += 1
+        else:
+            while min_tail > min_head and low[min_deque[min_tail - 1]] >= low[i]:
+                min_tail -= 1
+            min_deque[min_tail] = i
+            min_tail += 1
+        if i >= w and np.isnan(low[i - w]):
+            low_nan -= 1
+        if min_tail > min_head and min_deque[min_head] <= i - w:
+            min_head += 1
+        if np.isnan(high[i]):
+            high_nan += 1
+        else:
+            while max_tail > max_head and high[max_deque[max_tail - 1]] <= high[i]:
+                max_tail -= 1
+            max_deque[max_tail] = i
+            max_tail += 1
+        if i >= w and np.isnan(high[i - w]):
+            high_nan -= 1
+        if max_tail > max_head and max_deque[max_head] <= i - w:
+            max_head += 1
+        if i >= w - 1:
+            min_out[i] = np.nan if low_nan > 0 else low[min_deque[min_head]]
+            max_out[i] = np.nan if high_nan > 0 else high[max_deque[max_head]]
+    return min_out, max_out
+
+
+@numba.njit(cache=True, nogil=True)
+def sliding_mean_pair(a, b, w):
+    """Rolling means of two same-length arrays in a single pass.
+
+    Used by the RSI to average the gain and loss streams together instead of
+    walking the price deltas twice. Inputs are assumed NaN-free (they are
+    built with `np.where` from the diffed closes).
+    """
+    n = a.shape[0]
+    out_a = np.empty(n, dtype=np.float64)
+    out_b = np.empty(n, dtype=np.float64)
+    out_a[:min(w - 1, n)] = np.nan
+    out_b[:min(w - 1, n)] = np.nan
+    sa = 0.0
+    sb = 0.0
+    for i in range(n):
+        sa += a[i]
+        sb += b[i]
+        if i >= w:
+            sa -= a[i - w]
+            sb -= b[i - w]
+        if i >= w - 1:
+            out_a[i] = sa / w
+            out_b[i] = sb / w
+    return out_a, out_b
+
+
+@numba.njit(cache=True, nogil=True)
+def macd_kernel(close, a_fast, a_slow, a_sig):
+    """Fused MACD pass: fast EMA, slow EMA, signal EMA, and histogram.
+
+    The three exponential averages are held in scalar accumulators so the
+    kernel streams `close` exactly once, emitting the MACD line, signal line,
+    and histogram together instead of materializing five separate Series.
+    Smoothing factors are `2 / (period + 1)`, matching `ewm(adjust=False)`.
+    """
+    n = close.shape[0]
+    macd_out = np.empty(n, dtype=np.float64)
+    sig_out = np.empty(n, dtype=np.float64)
+    hist_out = np.empty(n, dtype=np.float64)
+    if n == 0:
+        return macd_out, sig_out, hist_out
+    ef = close[0]
+    es = close[0]
+    esig = 0.0
+    for i in range(n):
+        ef += a_fast * (close[i] - ef)
+        es += a_slow * (close[i] - es)
+        m = ef - es
+        esig += a_sig * (m - esig)
+        macd_out[i] = m
+        sig_out[i] = esig
+        hist_out[i] = m - esig
+    return macd_out, sig_out, hist_out
+
+
+@numba.njit(cache=True, nogil=True)
+def fused_indicators(close, high, low):
+    """Single-pass computation of the dashboard's full indicator set.
+
+    The per-indicator kernels each stream `close` (or `high`/`low`) once, so
+    running all seven back-to-back is memory-bound on re-reading the same
+    columns from DRAM. This kernel folds every accumulator — SMA-20/50 running
+    sums, EMA-20 and the three MACD EMAs, RSI gain/loss sums, the Bollinger
+    sum-of-squares (sharing SMA-20's window), and the stochastic min/max
+    deques — into one `for i in range(n)` loop, touching each input element
+    exactly once. Windows are the canonical dashboard parameters: SMA 20/50,
+    EMA 20, RSI 14, MACD 12/26/9, Bollinger 20/2, stochastic 14/3.
+
+    NaN inputs follow the standalone kernels: the counted windows (SMA,
+    Bollinger, stochastic) go NaN while a NaN sits inside them and recover
+    once it leaves; the EMA chain carries its state across gaps with
+    `ewm(adjust=False)`'s decayed-weight update; RSI treats NaN deltas as
+    zero change, matching the `np.where`-built gain/loss streams of the
+    standalone path.
+
+    Returns the arrays in the order: sma_20, sma_50, ema_20, rsi, macd,
+    macd_signal, macd_histogram, upper_band, lower_band, lowest_low,
+    highest_high, %K, %D. (middle_band is sma_20.)
+    """
+    n = close.shape[0]
+    sma20 = np.full(n, np.nan)
+    sma50 = np.full(n, np.nan)
+    ema20 = np.full(n, np.nan)
+    rsi = np.full(n, np.nan)
+    macd = np.full(n, np.nan)
+    macd_sig = np.full(n, np.nan)
+    macd_hist = np.full(n, np.nan)
+    upper = np.full(n, np.nan)
+    lower = np.full(n, np.nan)
+    ll = np.full(n, np.nan)
+    hh = np.full(n, np.nan)
+    k_out = np.full(n, np.nan)
+    d_out = np.full(n, np.nan)
+    if n == 0:
+        return sma20, sma50, ema20, rsi, macd, macd_sig, macd_hist, upper, lower, ll, hh, k_out, d_out
+
+    a20 = 2.0 / 21.0
+    a12 = 2.0 / 13.0
+    a26 = 2.0 / 27.0
+    a9 = 2.0 / 10.0
+
+    s20 = 0.0
+    s2_20 = 0.0
+    nan20 = 0
+    s50 = 0.0
+    nan50 = 0
+    e20 = 0.0
+    ef = 0.0
+    es = 0.0
+    esig = 0.0
+    ema_seeded = False
+    ema_gap = 0
+    gain_sum = 0.0
+    loss_sum = 0.0
+
+    min_deque = np.empty(n, dtype=np.int64)
+    max_deque = np.empty(n, dtype=np.int64)
+    min_head = 0
+    min_tail = 0
+    max_head = 0
+    max_tail = 0
+    low_nan = 0
+    high_nan = 0
+
+    for i in range(n):
+        c = close[i]
+        c_nan = np.isnan(c)
+
+        # SMA-20 and Bollinger (shared window): NaN-counted so a bad close
+        # blanks only the windows containing it, like sliding_mean_std
+        if c_nan:
+            nan20 += 1
+        else:
+            s20 += c
+            s2_20 += c * c
+        if i >= 20:
+            old = close[i - 20]
+            if np.isnan(old):
+                nan20 -= 1
+            else:
+                s20 -= old
+                s2_20 -= old * old
+        if i >= 19 and nan20 == 0:
+            m = s20 / 20.0
+            sma20[i] = m
+            var = (s2_20 - s20 * s20 / 20.0) / 19.0
+            sd = np.sqrt(max(var, 0.0))
+            upper[i] = m + 2.0 * sd
+            lower[i] = m - 2.0 * sd
+
+        # SMA-50
+        if c_nan:
+            nan50 += 1
+        else:
+            s50 += c
+        if i >= 50:
+            old = close[i - 50]
+            if np.isnan(old):
+                nan50 -= 1
+            else:
+                s50 -= old
+        if i >= 49 and nan50 == 0:
+            sma50[i] = s50 / 50.0
+
+        # EMA-20 and the MACD EMA chain. The state seeds at the first valid
+        # close and carries through gaps; a valid close arriving after a gap
+        # of g NaNs gets the renormalized update pandas' ewm(adjust=False,
+        # ignore_na=False) applies: the old state keeps weight (1-a)^(g+1)
+        # against the new value's weight a, normalized to sum to one. With
+        # g == 0 this reduces to the plain recurrence. The signal EMA keeps
+        # stepping during gaps because pandas feeds it the carried (non-NaN)
+        # MACD series.
+        if not c_nan:
+            if ema_seeded:
+                ow = (1.0 - a20) ** (ema_gap + 1)
+                e20 = (ow * e20 + a20 * c) / (ow + a20)
+                ow = (1.0 - a12) ** (ema_gap + 1)
+                ef = (ow * ef + a12 * c) / (ow + a12)
+                ow = (1.0 - a26) ** (ema_gap + 1)
+                es = (ow * es + a26 * c) / (ow + a26)
+                ema_gap = 0
+            else:
+                e20 = c
+                ef = c
+                es = c
+                esig = 0.0
+                ema_seeded = True
+        elif ema_seeded:
+            ema_gap += 1
+        if ema_seeded:
+            m_line = ef - es
+            esig += a9 * (m_line - esig)
+            ema20[i] = e20
+            macd[i] = m_line
+            macd_sig[i] = esig
+            macd_hist[i] = m_line - esig
+
+        # RSI-14: rolling gain/loss sums, reconstructing the delta leaving the
+        # window from close so no delta array is materialized. NaN deltas
+        # count as zero change, matching the np.where-built streams of the
+        # standalone path.
+        delta = c - close[i - 1] if i > 0 else 0.0
+        if np.isnan(delta):
+            delta = 0.0
+        if delta > 0:
+            gain_sum += delta
+        elif delta < 0:
+            loss_sum -= delta
+        if i >= 14:
+            old_delta = close[i - 14] - close[i - 15] if i >= 15 else 0.0
+            if np.isnan(old_delta):
+                old_delta = 0.0
+            if old_delta > 0:
+                gain_sum -= old_delta
+            elif old_delta < 0:
+                loss_sum += old_delta
+        if i >= 13:
+            loss_mean = loss_sum / 14.0
+            if loss_mean == 0:
+                rsi[i] = np.nan
+            else:
+                rsi[i] = 100.0 - 100.0 / (1.0 + (gain_sum / 14.0) / loss_mean)
+
+        # Stochastic: monotonic deques over low/high, window 14. NaN elements
+        # never enter the deques (their comparisons are always False) and are
+        # tracked with window counts instead, so a window containing NaN
+        # yields NaN rather than the extreme of the remaining values.
+        lv = low[i]
+        if np.isnan(lv):
+            low_nan += 1
+        else:
+            while min_tail > min_head and low[min_deque[min_tail - 1]] >= lv:
+                min_tail -= 1
+            min_deque[min_tail] = i
+            min_tail += 1
+        if i >= 14 and np.isnan(low[i - 14]):
+            low_nan -= 1
+        if min_tail > min_head and min_deque[min_head] <= i - 14:
+            min_head += 1
+        hv = high[i]
+        if np.isnan(hv):
+            high_nan += 1
+        else:
+            while max_tail > max_head and high[max_deque[max_tail - 1]] <= hv:
+                max_tail -= 1
+            max_deque[max_tail] = i
+            max_tail += 1
+        if i >= 14 and np.isnan(high[i - 14]):
+            high_nan -= 1
+        if max_tail > max_head and max_deque[max_head] <= i - 14:
+            max_head += 1
+        if i >= 13:
+            if low_nan == 0:
+                ll[i] = low[min_deque[min_head]]
+            if high_nan == 0:
+                hh[i] = high[max_deque[max_head]]
+            if low_nan == 0 and high_nan == 0:
+                low_v = low[min_deque[min_head]]
+                high_v = high[max_deque[max_head]]
+                price_range = high_v - low_v
+                if price_range != 0:
+                    k_out[i] = (c - low_v) / price_range * 100.0
+        # %D: 3-period mean of %K, NaN until three valid %K values exist
+        if i >= 15:
+            k0 = k_out[i - 2]
+            k1 = k_out[i - 1]
+            k2 = k_out[i]
+            if not (np.isnan(k0) or np.isnan(k1) or np.isnan(k2)):
+                d_out[i] = (k0 + k1 + k2) / 3.0
+
+    return sma20, sma50, ema20, rsi, macd, macd_sig, macd_hist, upper, lower, ll, hh, k_out, d_out
+
+
+@functools.lru_cache(maxsize=None)
+def make_sma_crossover(short_window, long_window):
+    """Builds a crossover kernel specialized for one (short, long) SMA pair.
+
+    Numba specializes dispatchers on argument types, not values, so a generic
+    kernel reloads the window sizes from registers every iteration. Closing
+    over them instead lets LLVM constant-fold the window arithmetic into the
+    running-sum update. Compiled kernels are memoized per pair, so repeated
+    calls (e.g. a hyperparameter sweep) pay compilation once.
+
+    The returned kernel maps a NaN-free close array to (buy, sell) boolean
+    masks with the same sign-change semantics as the strategy layer.
+    """
+    @numba.njit(cache=True, nogil=True)
+    def kernel(close):
+        n = close.shape[0]
+        buy = np.zeros(n, dtype=np.bool_)
+        sell = np.zeros(n, dtype=np.bool_)
+        short_sum = 0.0
+        long_sum = 0.0
+        prev_negative = False
+        have_prev = False
+        for i in range(n):
+            c = close[i]
+            short_sum += c
+            long_sum += c
+            if i >= short_window:
+                short_sum -= close[i - short_window]
+            if i >= long_window:
+                long_sum -= close[i - long_window]
+            if i >= long_window - 1 and i >= short_window - 1:
+                diff = short_sum / short_window - long_sum / long_window
+                negative = diff < 0
+                if have_prev:
+                    buy[i] = prev_negative and not negative
+                    sell[i] = negative and not prev_negative
+                prev_negative = negative
+                have_prev = True
+        return buy, sell
+
+    return kernel
+
+
+def _warmup():
+    """Trigger JIT compilation of every kernel at import.
+
+    The indicators all call the kernels with (float64[:], int64) signatures,
+    matching the dummy arguments here, so no user-facing call ever triggers a
+    fresh compile. A sweep over the module's dispatchers afterwards flags any
+    newly added kernel that was forgotten here.
+    """
+    dummy = np.zeros(16, dtype=np.float64)
+    sliding_mean(dummy, 3)
+    sliding_std(dummy, 3)
+    sliding_mean_std(dummy, 3)
+    sliding_min(dummy, 3)
+    sliding_max(dummy, 3)
+    sliding_minmax(dummy, dummy, 3)
+    sliding_mean_pair(dummy, dummy, 3)
+    macd_kernel(dummy, 0.5, 0.25, 0.2)
+    fused_indicators(dummy, dummy, dummy)
+
+    for name, obj in globals().items():
+        if isinstance(obj, numba.core.dispatcher.Dispatcher) and not obj.signatures:
+            print(f"Warning: kernel {name} is not pre-compiled; add it to _warmup().")
+
+
+_warmup()
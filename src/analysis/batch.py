@@ -0,0 +1,34 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+def compute_all(symbols, compute):
+    """
+    Runs an indicator pipeline for many symbols in parallel.
+
+    The per-symbol work is embarrassingly parallel, and the Numba kernels are
+    compiled with `nogil=True`, so worker threads release the GIL inside the
+    hot loops and actually scale across cores.
+
+    Args:
+        symbols: The stock symbols to compute.
+        compute: A callable taking a symbol and returning its DataFrame,
+            e.g. the dashboard's cached indicator pipeline.
+
+    Returns:
+        A dict mapping each symbol to its computed DataFrame. Symbols whose
+        computation raised are logged and left out rather than failing the batch.
+    """
+    results = {}
+    if not symbols:
+        return results
+
+    max_workers = min(len(symbols), os.cpu_count() or 1)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {symbol: executor.submit(compute, symbol) for symbol in symbols}
+        for symbol, future in futures.items():
+            try:
+                results[symbol] = future.result()
+            except Exception as e:
+                print(f"Indicator computation failed for {symbol}: {e}")
+
+    return results
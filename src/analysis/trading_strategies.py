@@ -1,6 +1,42 @@
+from collections import namedtuple
+
+import numpy as np
 import pandas as pd
 
-def sma_crossover_strategy(df: pd.DataFrame, short_window: int = 20, long_window: int = 50) -> pd.DataFrame:
+from src.analysis._window_kernels import make_sma_crossover
+
+# Buy/sell masks for one strategy, as plain boolean ndarrays. Strategies hand
+# these around instead of appending 2-3 columns each to the shared DataFrame,
+# which kept tripling the frame's footprint and forced combine_signals to
+# rediscover the signal columns by substring-matching their names.
+SignalPair = namedtuple('SignalPair', ['buy', 'sell'])
+
+def _crossover_signals(diff: np.ndarray) -> SignalPair:
+    """
+    Detects sign changes in a difference series in one branchless numpy pass.
+
+    A crossover is simply the sign of `a - b` flipping, so instead of the four
+    shifted-Series comparisons per strategy this computes the sign bit once and
+    diffs it. Rows where the diff (or its predecessor) is NaN are masked out so
+    the leading indicator warm-up region cannot emit spurious signals.
+
+    Args:
+        diff: The difference between the two series being compared.
+
+    Returns:
+        A SignalPair whose `buy` is True where the diff went from negative to
+        non-negative and `sell` the reverse.
+    """
+    sgn = np.signbit(diff).astype(np.int8)
+    cross = np.diff(sgn, prepend=sgn[:1])
+    valid = ~np.isnan(diff)
+    prev_valid = np.empty_like(valid)
+    prev_valid[0] = False
+    prev_valid[1:] = valid[:-1]
+    valid &= prev_valid
+    return SignalPair((cross < 0) & valid, (cross > 0) & valid)
+
+def sma_crossover_signals(sma_short: np.ndarray, sma_long: np.ndarray) -> SignalPair:
     """
     Implements a Simple Moving Average (SMA) crossover strategy.
 
@@ -8,25 +44,38 @@ def sma_crossover_strategy(df: pd.DataFrame, short_window: int = 20, long_window
     and 'Sell' signals when the short-term SMA crosses below the long-term SMA.
 
     Args:
-        df: A pandas DataFrame with 'close' prices and calculated SMAs (e.g., 'sma_20', 'sma_50').
-        short_window: The window size for the short-term SMA.
-        long_window: The window size for the long-term SMA.
+        sma_short: The short-term SMA values.
+        sma_long: The long-term SMA values.
 
     Returns:
-        A DataFrame with 'buy_signal' and 'sell_signal' columns (boolean).
+        A SignalPair of boolean buy/sell masks.
     """
-    df['short_sma'] = df[f'sma_{short_window}']
-    df['long_sma'] = df[f'sma_{long_window}']
+    sma_short = np.asarray(sma_short, dtype=np.float64)
+    sma_long = np.asarray(sma_long, dtype=np.float64)
+    return _crossover_signals(sma_short - sma_long)
 
-    # Generate signals
-    df['buy_signal'] = (df['short_sma'].shift(1) < df['long_sma'].shift(1)) & \
-                       (df['short_sma'] > df['long_sma'])
-    df['sell_signal'] = (df['short_sma'].shift(1) > df['long_sma'].shift(1)) & \
-                        (df['short_sma'] < df['long_sma'])
+def sma_crossover_from_close(close: np.ndarray, short_window: int, long_window: int) -> SignalPair:
+    """
+    Computes SMA crossover signals straight from closing prices.
 
-    return df
+    Uses a Numba kernel specialized (and cached) per (short, long) window pair
+    with the window sizes constant-folded into the running-sum loop, so
+    sweeping many parameter pairs over the same closes avoids both the
+    intermediate SMA arrays and per-value window arithmetic.
 
-def rsi_strategy(df: pd.DataFrame, overbought_level: int = 70, oversold_level: int = 30) -> pd.DataFrame:
+    Args:
+        close: The closing prices (NaN-free).
+        short_window: The window size for the short-term SMA.
+        long_window: The window size for the long-term SMA.
+
+    Returns:
+        A SignalPair of boolean buy/sell masks.
+    """
+    kernel = make_sma_crossover(short_window, long_window)
+    buy, sell = kernel(np.asarray(close, dtype=np.float64))
+    return SignalPair(buy, sell)
+
+def rsi_signals(rsi: np.ndarray, overbought_level: int = 70, oversold_level: int = 30) -> SignalPair:
     """
     Implements an RSI (Relative Strength Index) strategy.
 
@@ -34,18 +83,19 @@ def rsi_strategy(df: pd.DataFrame, overbought_level: int = 70, oversold_level: i
     and 'Sell' signals when RSI crosses above the overbought level.
 
     Args:
-        df: A pandas DataFrame with an 'rsi' column.
+        rsi: The RSI values.
         overbought_level: The RSI level considered overbought.
         oversold_level: The RSI level considered oversold.
 
     Returns:
-        A DataFrame with 'rsi_buy_signal' and 'rsi_sell_signal' columns (boolean).
+        A SignalPair of boolean buy/sell masks.
     """
-    df['rsi_buy_signal'] = (df['rsi'].shift(1) > oversold_level) & (df['rsi'] <= oversold_level)
-    df['rsi_sell_signal'] = (df['rsi'].shift(1) < overbought_level) & (df['rsi'] >= overbought_level)
-    return df
+    rsi = np.asarray(rsi, dtype=np.float64)
+    _, buy = _crossover_signals(rsi - oversold_level)
+    sell, _ = _crossover_signals(rsi - overbought_level)
+    return SignalPair(buy, sell)
 
-def macd_crossover_strategy(df: pd.DataFrame) -> pd.DataFrame:
+def macd_crossover_signals(macd: np.ndarray, macd_signal: np.ndarray) -> SignalPair:
     """
     Implements a MACD (Moving Average Convergence Divergence) crossover strategy.
 
@@ -53,18 +103,17 @@ def macd_crossover_strategy(df: pd.DataFrame) -> pd.DataFrame:
     and 'Sell' signals when the MACD line crosses below the Signal line.
 
     Args:
-        df: A pandas DataFrame with 'macd' and 'macd_signal' columns.
+        macd: The MACD line values.
+        macd_signal: The signal line values.
 
     Returns:
-        A DataFrame with 'macd_buy_signal' and 'macd_sell_signal' columns (boolean).
+        A SignalPair of boolean buy/sell masks.
     """
-    df['macd_buy_signal'] = (df['macd'].shift(1) < df['macd_signal'].shift(1)) & \
-                            (df['macd'] > df['macd_signal'])
-    df['macd_sell_signal'] = (df['macd'].shift(1) > df['macd_signal'].shift(1)) & \
-                             (df['macd'] < df['macd_signal'])
-    return df
+    macd = np.asarray(macd, dtype=np.float64)
+    macd_signal = np.asarray(macd_signal, dtype=np.float64)
+    return _crossover_signals(macd - macd_signal)
 
-def bollinger_bands_strategy(df: pd.DataFrame) -> pd.DataFrame:
+def bollinger_bands_signals(close: np.ndarray, upper_band: np.ndarray, lower_band: np.ndarray) -> SignalPair:
     """
     Implements a Bollinger Bands strategy.
 
@@ -72,70 +121,59 @@ def bollinger_bands_strategy(df: pd.DataFrame) -> pd.DataFrame:
     and 'Sell' signals when the price crosses above the upper band.
 
     Args:
-        df: A pandas DataFrame with 'close', 'upper_band', and 'lower_band' columns.
+        close: The closing prices.
+        upper_band: The upper Bollinger Band.
+        lower_band: The lower Bollinger Band.
 
     Returns:
-        A DataFrame with 'bb_buy_signal' and 'bb_sell_signal' columns (boolean).
+        A SignalPair of boolean buy/sell masks.
     """
-    df['bb_buy_signal'] = (df['close'] < df['lower_band'])
-    df['bb_sell_signal'] = (df['close'] > df['upper_band'])
-    return df
+    close = np.asarray(close, dtype=np.float64)
+    return SignalPair(close < np.asarray(lower_band, dtype=np.float64),
+                      close > np.asarray(upper_band, dtype=np.float64))
 
-def stochastic_oscillator_strategy(df: pd.DataFrame, overbought_level: int = 80, oversold_level: int = 20) -> pd.DataFrame:
+def stochastic_oscillator_signals(k: np.ndarray, d: np.ndarray,
+                                  overbought_level: int = 80, oversold_level: int = 20) -> SignalPair:
     """
     Implements a Stochastic Oscillator strategy.
 
-    Generates 'Buy' signals when %K crosses above %D, especially when both are below the oversold level,
-    and 'Sell' signals when %K crosses below %D, especially when both are above the overbought level.
+    Generates 'Buy' signals when %K crosses above %D while below the oversold
+    level, and 'Sell' signals when %K crosses below %D while above the
+    overbought level.
 
     Args:
-        df: A pandas DataFrame with '%K' and '%D' columns.
+        k: The %K values.
+        d: The %D values.
         overbought_level: The level considered overbought.
         oversold_level: The level considered oversold.
 
     Returns:
-        A DataFrame with 'stoch_buy_signal' and 'stoch_sell_signal' columns (boolean).
+        A SignalPair of boolean buy/sell masks.
     """
-    df['stoch_buy_signal'] = (df['%K'].shift(1) < df['%D'].shift(1)) & \
-                             (df['%K'] > df['%D']) & \
-                             (df['%K'] < oversold_level)
-    df['stoch_sell_signal'] = (df['%K'].shift(1) > df['%D'].shift(1)) & \
-                              (df['%K'] < df['%D']) & \
-                              (df['%K'] > overbought_level)
-    return df
+    k = np.asarray(k, dtype=np.float64)
+    cross_up, cross_down = _crossover_signals(k - np.asarray(d, dtype=np.float64))
+    return SignalPair(cross_up & (k < oversold_level), cross_down & (k > overbought_level))
 
-def combine_signals(df: pd.DataFrame) -> pd.DataFrame:
+def combine_signals(pairs: list) -> SignalPair:
     """
     Combines buy/sell signals from multiple strategies.
 
-    A 'strong_buy_signal' is generated if at least two buy signals are present
-    and no sell signals are present from any strategy.
-    A 'strong_sell_signal' is generated if at least two sell signals are present
-    and no buy signals are present from any strategy.
+    A strong buy is generated if at least two strategies agree on buying and
+    none wants to sell; a strong sell is the mirror image.
 
     Args:
-        df: A pandas DataFrame containing individual strategy signals
-            (e.g., 'buy_signal', 'sell_signal', 'rsi_buy_signal', etc.).
+        pairs: The SignalPair produced by each strategy.
 
     Returns:
-        A DataFrame with 'strong_buy_signal' and 'strong_sell_signal' columns (boolean).
+        A SignalPair of boolean strong-buy/strong-sell masks.
     """
-    # Initialize combined signals to False
-    df['strong_buy_signal'] = False
-    df['strong_sell_signal'] = False
-
-    # Count buy and sell signals for each row
-    buy_signal_columns = [col for col in df.columns if 'buy_signal' in col and col != 'strong_buy_signal']
-    sell_signal_columns = [col for col in df.columns if 'sell_signal' in col and col != 'strong_sell_signal']
-
-    df['buy_signal_count'] = df[buy_signal_columns].sum(axis=1)
-    df['sell_signal_count'] = df[sell_signal_columns].sum(axis=1)
+    # Counts fit in int8 (at most one vote per strategy), so stack the masks
+    # and sum in numpy rather than pandas' per-row int64 path.
+    buy_counts = np.column_stack([p.buy for p in pairs]).sum(axis=1, dtype=np.int8)
+    sell_counts = np.column_stack([p.sell for p in pairs]).sum(axis=1, dtype=np.int8)
 
-    # Define combination logic
-    df['strong_buy_signal'] = (df['buy_signal_count'] >= 2) & (df['sell_signal_count'] == 0)
-    df['strong_sell_signal'] = (df['sell_signal_count'] >= 2) & (df['buy_signal_count'] == 0)
-
-    return df
+    return SignalPair((buy_counts >= 2) & (sell_counts == 0),
+                      (sell_counts >= 2) & (buy_counts == 0))
 
 if __name__ == '__main__':
     # Create a sample DataFrame for testing
@@ -153,50 +191,34 @@ if __name__ == '__main__':
     df['sma_3'] = df['close'].rolling(window=3).mean()
 
     # Apply SMA strategy
-    df = sma_crossover_strategy(df, short_window=2, long_window=3)
+    sma_pair = sma_crossover_signals(df['sma_2'].to_numpy(), df['sma_3'].to_numpy())
 
-    # Calculate RSI (assuming this is already calculated by technical_analysis)
-    # Dummy RSI for testing
+    # Dummy indicator values for testing the remaining strategies
     df['rsi'] = [50, 40, 35, 25, 28, 32, 60, 75, 72, 65]
-
-    # Apply RSI strategy
-    df = rsi_strategy(df)
-
-    # Calculate MACD (assuming this is already calculated by technical_analysis)
-    # Dummy MACD for testing
     df['macd'] = [1, 2, 3, 2, 1, 0, -1, -2, -3, -2]
     df['macd_signal'] = [0.5, 1.5, 2.5, 2.0, 1.0, 0.0, -0.5, -1.5, -2.5, -2.0]
-
-    # Apply MACD strategy
-    df = macd_crossover_strategy(df)
-
-    # Calculate Bollinger Bands (assuming this is already calculated by technical_analysis)
-    # Dummy Bollinger Bands for testing
     df['upper_band'] = [105, 107, 106, 108, 110, 109, 111, 112, 110, 108]
     df['lower_band'] = [95, 97, 96, 98, 100, 99, 101, 102, 100, 98]
-
-    # Apply Bollinger Bands strategy
-    df = bollinger_bands_strategy(df)
-
-    # Calculate Stochastic Oscillator (assuming this is already calculated by technical_analysis)
     df['%K'] = [20, 30, 40, 50, 60, 70, 80, 90, 70, 60]
     df['%D'] = [25, 35, 45, 55, 65, 75, 85, 80, 70, 65]
 
-    # Apply Stochastic Oscillator strategy
-    df = stochastic_oscillator_strategy(df)
+    rsi_pair = rsi_signals(df['rsi'].to_numpy())
+    macd_pair = macd_crossover_signals(df['macd'].to_numpy(), df['macd_signal'].to_numpy())
+    bb_pair = bollinger_bands_signals(df['close'].to_numpy(), df['upper_band'].to_numpy(), df['lower_band'].to_numpy())
+    stoch_pair = stochastic_oscillator_signals(df['%K'].to_numpy(), df['%D'].to_numpy())
 
     # Combine signals
-    df = combine_signals(df)
+    strong = combine_signals([sma_pair, rsi_pair, macd_pair, bb_pair, stoch_pair])
 
     print("SMA Crossover Signals:")
-    print(df[['close', 'sma_2', 'sma_3', 'buy_signal', 'sell_signal']])
+    print(pd.DataFrame({'close': df['close'], 'buy': sma_pair.buy, 'sell': sma_pair.sell}))
     print("\nRSI Signals:")
-    print(df[['close', 'rsi', 'rsi_buy_signal', 'rsi_sell_signal']])
+    print(pd.DataFrame({'rsi': df['rsi'], 'buy': rsi_pair.buy, 'sell': rsi_pair.sell}))
     print("\nMACD Signals:")
-    print(df[['close', 'macd', 'macd_signal', 'macd_buy_signal', 'macd_sell_signal']])
+    print(pd.DataFrame({'macd': df['macd'], 'buy': macd_pair.buy, 'sell': macd_pair.sell}))
     print("\nBollinger Bands Signals:")
-    print(df[['close', 'upper_band', 'lower_band', 'bb_buy_signal', 'bb_sell_signal']])
+    print(pd.DataFrame({'close': df['close'], 'buy': bb_pair.buy, 'sell': bb_pair.sell}))
     print("\nStochastic Oscillator Signals:")
-    print(df[['close', '%K', '%D', 'stoch_buy_signal', 'stoch_sell_signal']])
+    print(pd.DataFrame({'%K': df['%K'], 'buy': stoch_pair.buy, 'sell': stoch_pair.sell}))
     print("\nCombined Signals:")
-    print(df[['close', 'buy_signal_count', 'sell_signal_count', 'strong_buy_signal', 'strong_sell_signal']])
\ No newline at end of file
+    print(pd.DataFrame({'close': df['close'], 'strong_buy': strong.buy, 'strong_sell': strong.sell}))
@@ -1,9 +1,12 @@
+import functools
 import os
 import json
 
+@functools.lru_cache(maxsize=1)
 def get_alpha_vantage_api_key():
     """
     Reads the Alpha Vantage API key from the .ALPHA_VANTAGE_KEY.txt file.
+    Cached after the first read so the hot callback path never re-opens the file.
     """
     # Assuming the script is run from the root of the project
     api_key_file = os.path.join(os.getcwd(), '.ALPHA_VANTAGE_KEY.txt')
@@ -12,9 +15,11 @@ def get_alpha_vantage_api_key():
             return f.read().strip()
     return os.getenv('ALPHA_VANTAGE_API_KEY') # Fallback to environment variable
 
+@functools.lru_cache(maxsize=1)
 def get_schwab_api_credentials():
     """
     Reads the Schwab API credentials from the schwab_config.json file.
+    Cached after the first read so repeated client construction skips the disk.
     """
     config_path = os.path.join(os.getcwd(), 'schwab_config.json')
     if os.path.exists(config_path):
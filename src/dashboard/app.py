@@ -1,9 +1,14 @@
 
+import logging
+
 import dash
 from dash import dcc, html
 
 from src.dashboard.callbacks import register_callbacks
 
+# Keep callback debug output off stdout unless explicitly enabled
+logging.basicConfig(level=logging.WARNING)
+
 app = dash.Dash(__name__, suppress_callback_exceptions=True)
 
 app.layout = html.Div([
@@ -1,23 +1,168 @@
+import functools
+import logging
+import threading
+from collections import OrderedDict
+from datetime import date
+
 import dash
+import numpy as np
+import plotly.graph_objects as go
 from dash.dependencies import Input, Output, State
 from dash import html, dcc # Added dcc
-from src.data.market_data import get_daily_data
-from src.analysis.technical_analysis import calculate_sma, calculate_ema, calculate_rsi, calculate_macd, calculate_bollinger_bands, calculate_stochastic_oscillator
-from src.analysis.trading_strategies import sma_crossover_strategy, rsi_strategy, macd_crossover_strategy, bollinger_bands_strategy, stochastic_oscillator_strategy, combine_signals
-from src.dashboard.visualizations import plot_stock_data
+from src.data.market_data import get_daily_data, get_symbol_universe
+from src.analysis.technical_analysis import calculate_all_indicators
+from src.analysis.trading_strategies import sma_crossover_signals, rsi_signals, macd_crossover_signals, bollinger_bands_signals, stochastic_oscillator_signals, combine_signals
+from src.analysis.batch import compute_all
+from src.dashboard.visualizations import plot_stock_data, PLOT_COLUMNS
 from src.dashboard.layouts import portfolio_performance_layout, watchlist_layout
 from src.config import get_alpha_vantage_api_key
 from src.utils import read_watchlist, write_watchlist
 from src.trading.schwab_api import get_positions # Changed import
 
+logger = logging.getLogger(__name__)
+
 def is_valid_symbol(symbol, api_key):
+    # O(1) lookup against the cached listing universe — no network on the
+    # add-to-watchlist click.
+    universe = get_symbol_universe(api_key)
+    if universe:
+        return symbol.upper() in universe
+
+    # Universe unavailable (e.g. listing endpoint down): fall back to probing
+    # for actual price data.
     try:
-        # Try to fetch a small amount of data to validate the symbol
         df = get_daily_data(symbol, api_key)
         return not df.empty
     except Exception:
         return False
 
+# Cached indicator DataFrames, LRU-ordered and bounded both by entry count
+# and by total resident bytes. Sizes are tracked per entry and subtracted on
+# eviction, so the budget reflects the frames actually held rather than
+# lifetime allocation.
+_INDICATOR_CACHE_MAX_BYTES = 256 * 1024 * 1024
+_INDICATOR_CACHE_MAX_ENTRIES = 64
+_indicator_cache = OrderedDict()  # (symbol, day) -> (df, nbytes)
+_indicator_cache_bytes = 0
+_indicator_cache_lock = threading.Lock()
+
+def _store_indicator_frame(key, df):
+    """
+    Inserts a frame into the LRU, evicting oldest entries past the caps.
+
+    Evictions forced by the byte budget also clear the figure cache: the
+    cached figures hold references to the evicted frames' column data, so
+    without that the byte cap would not actually bound memory.
+    """
+    global _indicator_cache_bytes
+    nbytes = int(df.memory_usage(deep=True).sum())
+    over_budget = False
+    with _indicator_cache_lock:
+        prev = _indicator_cache.pop(key, None)
+        if prev is not None:
+            _indicator_cache_bytes -= prev[1]
+        _indicator_cache[key] = (df, nbytes)
+        _indicator_cache_bytes += nbytes
+        while len(_indicator_cache) > _INDICATOR_CACHE_MAX_ENTRIES:
+            _, (_, evicted_bytes) = _indicator_cache.popitem(last=False)
+            _indicator_cache_bytes -= evicted_bytes
+        # Keep at least the frame just inserted, even if it alone is over.
+        while _indicator_cache_bytes > _INDICATOR_CACHE_MAX_BYTES \
+                and len(_indicator_cache) > 1:
+            _, (_, evicted_bytes) = _indicator_cache.popitem(last=False)
+            _indicator_cache_bytes -= evicted_bytes
+            over_budget = True
+    if over_budget:
+        _build_figure.cache_clear()
+
+def _compute_indicators(symbol, day):
+    """
+    Fetches daily data and runs the full indicator + strategy pipeline.
+
+    Cached per (symbol, day) so toggling between watchlist symbols reuses the
+    already-computed DataFrame instead of re-fetching and re-deriving every
+    indicator on each callback. The `day` key rolls the cache over at midnight.
+    """
+    key = (symbol, day)
+    with _indicator_cache_lock:
+        entry = _indicator_cache.get(key)
+        if entry is not None:
+            _indicator_cache.move_to_end(key)
+            return entry[0]
+
+    api_key = get_alpha_vantage_api_key()
+    df = get_daily_data(symbol, api_key)
+
+    # Arrow-backed columns serialize to the browser faster than numpy object
+    # round-trips and slice zero-copy inside pandas; the kernels still get
+    # contiguous float64 from .to_numpy().
+    df = df.convert_dtypes(dtype_backend='pyarrow')
+
+    # Lazy %-formatting: the pandas reprs are only built when DEBUG is enabled,
+    # so the chart-refresh hot path pays nothing for this in normal operation.
+    logger.debug("update_graph: empty=%s columns=%s", df.empty, df.columns.tolist())
+    logger.debug("update_graph head:\n%s", df.head())
+
+    # One fused pass over close/high/low instead of seven per-indicator passes
+    df = calculate_all_indicators(df)
+
+    # Apply trading strategies on the indicator arrays; each returns a
+    # SignalPair of boolean masks rather than growing the DataFrame.
+    sma_pair = sma_crossover_signals(df['sma_20'].to_numpy(), df['sma_50'].to_numpy())
+    rsi_pair = rsi_signals(df['rsi'].to_numpy())
+    macd_pair = macd_crossover_signals(df['macd'].to_numpy(), df['macd_signal'].to_numpy())
+    bb_pair = bollinger_bands_signals(df['close'].to_numpy(), df['upper_band'].to_numpy(), df['lower_band'].to_numpy())
+    stoch_pair = stochastic_oscillator_signals(df['%K'].to_numpy(), df['%D'].to_numpy())
+
+    # Combine signals
+    strong = combine_signals([sma_pair, rsi_pair, macd_pair, bb_pair, stoch_pair])
+
+    # The plot still reads the signals as DataFrame columns
+    df['buy_signal'], df['sell_signal'] = sma_pair
+    df['rsi_buy_signal'], df['rsi_sell_signal'] = rsi_pair
+    df['macd_buy_signal'], df['macd_sell_signal'] = macd_pair
+    df['bb_buy_signal'], df['bb_sell_signal'] = bb_pair
+    df['stoch_buy_signal'], df['stoch_sell_signal'] = stoch_pair
+    df['strong_buy_signal'], df['strong_sell_signal'] = strong
+
+    _store_indicator_frame(key, df)
+    return df
+
+@functools.lru_cache(maxsize=64)
+def _build_figure(symbol, day, last_timestamp, nrows):
+    """
+    Builds (and memoizes) the indicator figure for one symbol.
+
+    last_timestamp and nrows fingerprint the underlying DataFrame, so a
+    redraw with unchanged data skips the ~20-trace figure construction
+    entirely; the df itself comes out of the _compute_indicators cache.
+    """
+    df = _compute_indicators(symbol, day)
+
+    # Hand the figure builder one columnar dict of numpy arrays (SoA)
+    # instead of the DataFrame, so no per-trace pandas conversion runs
+    # inside the plot. Numeric series go down to float32: the chart shows
+    # two decimals, and halving the bytes halves both the figure's JSON
+    # serialization time and the payload shipped to the browser. Columns
+    # already stored as float32 pass through without a copy.
+    arrs = {col: df[col].to_numpy() if col.endswith('_signal')
+            else df[col].to_numpy().astype(np.float32, copy=False)
+            for col in PLOT_COLUMNS}
+    return plot_stock_data(df.index.to_numpy(), arrs, symbol)
+
+# Allows at most one background pre-warm at a time; released by the warm
+# thread so a rapid series of dropdown refreshes doesn't stack threads.
+_prewarm_lock = threading.Lock()
+
+def _prewarm_indicators(symbols, today):
+    """Background cache warm; the caller holds _prewarm_lock."""
+    try:
+        compute_all(symbols, lambda symbol: _compute_indicators(symbol, today))
+    except Exception as e:
+        print(f"Indicator pre-warm failed: {e}")
+    finally:
+        _prewarm_lock.release()
+
 def register_callbacks(app):
     @app.callback(
         Output('stock-graph', 'figure'),
@@ -28,34 +173,12 @@ def register_callbacks(app):
         if not api_key:
             return {}
 
-        df = get_daily_data(symbol, api_key)
-        
-        print("--- Debugging update_graph ---")
-        print("DataFrame empty:", df.empty)
-        print("DataFrame columns:", df.columns.tolist())
-        print("DataFrame head:\n", df.head())
-        print("--- End Debugging update_graph ---")
-
-        df = calculate_sma(df, window=20)
-        df = calculate_sma(df, window=50) # Calculate sma_50
-        df = calculate_ema(df, window=20)
-        df = calculate_rsi(df)
-        df = calculate_macd(df)
-        df = calculate_bollinger_bands(df)
-        df = calculate_stochastic_oscillator(df)
-        
-        # Apply trading strategies
-        df = sma_crossover_strategy(df, short_window=20, long_window=50)
-        df = rsi_strategy(df)
-        df = macd_crossover_strategy(df)
-        df = bollinger_bands_strategy(df)
-        df = stochastic_oscillator_strategy(df)
-
-        # Combine signals
-        df = combine_signals(df)
+        day = str(date.today())
+        df = _compute_indicators(symbol, day)
 
-        fig = plot_stock_data(df, symbol)
-        return fig
+        fig = _build_figure(symbol, day, str(df.index[-1]), len(df))
+        # Hand Dash a cheap clone so cached figures can't be mutated in place.
+        return go.Figure(fig)
 
     @app.callback(
         Output('tabs-content', 'children'),
@@ -140,6 +263,16 @@ def register_callbacks(app):
         all_symbols = sorted(list(set(watchlist_symbols + portfolio_symbols)))
         options = [{'label': symbol, 'value': symbol} for symbol in all_symbols]
 
+        # Pre-warm the indicator cache for every symbol in one parallel burst.
+        # The warm runs on a background thread so the dropdown renders
+        # immediately even on a cold cache; per-symbol single-flight in the
+        # data layer lets the burst's misses genuinely overlap and keeps a
+        # user selecting a symbol mid-warm from duplicating its fetch.
+        if get_alpha_vantage_api_key() and _prewarm_lock.acquire(blocking=False):
+            today = str(date.today())
+            threading.Thread(target=_prewarm_indicators,
+                             args=(all_symbols, today), daemon=True).start()
+
         # Set default value to the first symbol in the combined list, if any
         default_value = all_symbols[0] if all_symbols else None
 
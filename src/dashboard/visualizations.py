@@ -1,15 +1,124 @@
+import numpy as np
 import plotly.graph_objects as go
+import plotly.io as pio
 from plotly.subplots import make_subplots
-import pandas as pd
 
-def plot_stock_data(df: pd.DataFrame, symbol: str):
+# Serialize figures with orjson: it zero-copies the numpy float arrays the
+# traces are built from, cutting the per-callback JSON encode severalfold
+# versus the stdlib json engine.
+pio.json.config.default_engine = 'orjson'
+
+# Columns plot_stock_data reads. The caller converts exactly these to numpy
+# once (structure-of-arrays) so no per-trace pandas conversion happens inside
+# the figure build.
+PLOT_COLUMNS = [
+    'open', 'high', 'low', 'close',
+    'sma_20', 'sma_50', 'ema_20',
+    'upper_band', 'middle_band', 'lower_band',
+    'rsi', 'macd', 'macd_signal', 'macd_histogram',
+    '%K', '%D',
+    'buy_signal', 'sell_signal',
+    'bb_buy_signal', 'bb_sell_signal',
+    'rsi_buy_signal', 'rsi_sell_signal',
+    'macd_buy_signal', 'macd_sell_signal',
+    'stoch_buy_signal', 'stoch_sell_signal',
+    'strong_buy_signal', 'strong_sell_signal',
+]
+
+# Moving-average line traces for the price subplot: (column, legend name,
+# line style). Fixed at import time so the figure build never searches the
+# frame's columns for 'sma'/'ema' names.
+MA_LINE_TRACES = [
+    ('sma_20', 'SMA 20', dict(color='#2196f3', width=1)),
+    ('sma_50', 'SMA 50', dict(color='#ff9800', width=1)),
+    ('ema_20', 'EMA 20', dict(color='#9c27b0', width=1)),
+]
+
+# One entry per signal type: (signal column, y-value column, marker symbol,
+# marker color, marker size, hover label, subplot row). All signals sharing a
+# row are emitted as a single marker trace with per-point symbol/color arrays,
+# which cuts the trace count roughly in half versus one trace per signal.
+SIGNAL_MARKERS = [
+    ('buy_signal', 'close', 'triangle-up', '#4caf50', 10, 'SMA Buy', 1),
+    ('sell_signal', 'close', 'triangle-down', '#f44336', 10, 'SMA Sell', 1),
+    ('bb_buy_signal', 'close', 'circle', '#2196f3', 10, 'BB Buy', 1),
+    ('bb_sell_signal', 'close', 'x', '#ff9800', 10, 'BB Sell', 1),
+    ('strong_buy_signal', 'close', 'star', '#00c853', 12, 'Strong Buy', 1),
+    ('strong_sell_signal', 'close', 'star', '#d50000', 12, 'Strong Sell', 1),
+    ('rsi_buy_signal', 'rsi', 'triangle-up', '#4caf50', 10, 'RSI Buy', 2),
+    ('rsi_sell_signal', 'rsi', 'triangle-down', '#f44336', 10, 'RSI Sell', 2),
+    ('macd_buy_signal', 'macd', 'circle', '#4caf50', 10, 'MACD Buy', 2),
+    ('macd_sell_signal', 'macd', 'x', '#f44336', 10, 'MACD Sell', 2),
+    ('stoch_buy_signal', '%K', 'triangle-up', '#4caf50', 10, 'Stoch Buy', 3),
+    ('stoch_sell_signal', '%K', 'triangle-down', '#f44336', 10, 'Stoch Sell', 3),
+]
+
+def _hline(y, color, xref, yref):
+    return dict(type='line', x0=0, x1=1, xref=xref, y0=y, y1=y, yref=yref,
+                line=dict(color=color, dash='dash'))
+
+# Overbought/oversold guide lines as precomputed layout shapes (row 2 draws
+# on axes x2/y2, row 3 on x3/y3); one update_layout assignment replaces four
+# add_hline validation passes per render.
+_GUIDE_SHAPES = [
+    _hline(70, 'red', 'x2 domain', 'y2'),
+    _hline(30, 'green', 'x2 domain', 'y2'),
+    _hline(80, 'red', 'x3 domain', 'y3'),
+    _hline(20, 'green', 'x3 domain', 'y3'),
+]
+
+def _signal_traces(index, arrs):
+    """
+    Builds one consolidated marker trace per subplot row for all trade signals.
+
+    Each signal's rows are looked up once with np.flatnonzero; the per-row
+    traces carry per-point symbol/color/size arrays and a hovertext label
+    naming the signal, so the visual encoding matches the old one-trace-per-
+    signal layout at a fraction of the trace count.
+
+    Returns:
+        A list of (trace, row) pairs.
+    """
+    rows = {}
+    for col, y_col, symbol, color, size, label, row in SIGNAL_MARKERS:
+        idx = np.flatnonzero(arrs[col])
+        if idx.size == 0:
+            continue
+        x, y, symbols, colors, sizes, labels = rows.setdefault(
+            row, ([], [], [], [], [], []))
+        x.append(index[idx])
+        y.append(arrs[y_col][idx])
+        symbols.extend([symbol] * idx.size)
+        colors.extend([color] * idx.size)
+        sizes.extend([size] * idx.size)
+        labels.extend([label] * idx.size)
+
+    return [(go.Scattergl(
+                x=np.concatenate(x),
+                y=np.concatenate(y),
+                mode='markers',
+                marker=dict(symbol=symbols, color=colors, size=sizes),
+                hovertext=labels,
+                name='Signals',
+                showlegend=(row == 1)), row)
+            for row, (x, y, symbols, colors, sizes, labels) in sorted(rows.items())]
+
+def plot_stock_data(index, arrs: dict, symbol: str):
     """
     Plots the stock data with technical indicators and trade signals.
 
+    Line series use go.Scattergl so the browser renders them through WebGL
+    (one draw call over a compact vertex buffer) instead of one SVG node per
+    point; Candlestick and Bar stay as-is since they have no GL equivalents.
+    All traces are collected into a list and attached with a single
+    fig.add_traces call, so Plotly extends and revalidates the trace list
+    once instead of per trace.
+
     Args:
-        df: A pandas DataFrame with price data, technical indicators, and 'buy_signal'/'sell_signal' columns.
+        index: The timestamp index as a numpy array.
+        arrs: A dict of numpy arrays keyed by the PLOT_COLUMNS names.
         symbol: The stock symbol.
-        
+
     Returns:
         A plotly figure.
     """
@@ -18,174 +127,43 @@ def plot_stock_data(df: pd.DataFrame, symbol: str):
                        subplot_titles=(f'{symbol} Candlestick', 'RSI and MACD', 'Stochastic Oscillator', 'Combined Signals'),
                        row_heights=[0.5, 0.15, 0.15, 0.2])
 
+    traces = []
+
     # Candlestick chart
-    fig.add_trace(go.Candlestick(x=df.index,
-                                 open=df['open'],
-                                 high=df['high'],
-                                 low=df['low'],
-                                 close=df['close'],
-                                 increasing_line_color='#26a69a', # Green for increasing
-                                 decreasing_line_color='#ef5350', # Red for decreasing
-                                 name='Candlestick'),
-                  row=1, col=1)
+    traces.append((go.Candlestick(x=index,
+                                  open=arrs['open'],
+                                  high=arrs['high'],
+                                  low=arrs['low'],
+                                  close=arrs['close'],
+                                  increasing_line_color='#26a69a', # Green for increasing
+                                  decreasing_line_color='#ef5350', # Red for decreasing
+                                  name='Candlestick'), 1))
 
     # Moving Averages
-    fig.add_trace(go.Scatter(x=df.index, y=df['sma_20'], name='SMA 20', line=dict(color='#2196f3', width=1)), row=1, col=1)
-    fig.add_trace(go.Scatter(x=df.index, y=df['sma_50'], name='SMA 50', line=dict(color='#ff9800', width=1)), row=1, col=1)
-    fig.add_trace(go.Scatter(x=df.index, y=df['ema_20'], name='EMA 20', line=dict(color='#9c27b0', width=1)), row=1, col=1)
+    traces.extend((go.Scattergl(x=index, y=arrs[col], name=name, line=line), 1)
+                  for col, name, line in MA_LINE_TRACES)
 
     # Bollinger Bands
-    fig.add_trace(go.Scatter(x=df.index, y=df['upper_band'], name='Upper Band', line=dict(color='#4caf50', width=1, dash='dash')),
-                  row=1, col=1)
-    fig.add_trace(go.Scatter(x=df.index, y=df['middle_band'], name='Middle Band', line=dict(color='#ffeb3b', width=1)),
-                  row=1, col=1)
-    fig.add_trace(go.Scatter(x=df.index, y=df['lower_band'], name='Lower Band', line=dict(color='#f44336', width=1, dash='dash')),
-                  row=1, col=1)
-
-    # Buy Signals (SMA Crossover)
-    buy_signals_sma = df[df['buy_signal']]
-    fig.add_trace(go.Scatter(
-        x=buy_signals_sma.index,
-        y=buy_signals_sma['close'],
-        mode='markers',
-        marker=dict(symbol='triangle-up', size=10, color='#4caf50'), # Green
-        name='SMA Buy Signal',
-        showlegend=True
-    ), row=1, col=1)
-
-    # Sell Signals (SMA Crossover)
-    sell_signals_sma = df[df['sell_signal']]
-    fig.add_trace(go.Scatter(
-        x=sell_signals_sma.index,
-        y=sell_signals_sma['close'],
-        mode='markers',
-        marker=dict(symbol='triangle-down', size=10, color='#f44336'), # Red
-        name='SMA Sell Signal',
-        showlegend=True
-    ), row=1, col=1)
-
-    # Buy Signals (Bollinger Bands)
-    buy_signals_bb = df[df['bb_buy_signal']]
-    fig.add_trace(go.Scatter(
-        x=buy_signals_bb.index,
-        y=buy_signals_bb['close'],
-        mode='markers',
-        marker=dict(symbol='circle', size=10, color='#2196f3', line=dict(width=2, color='#1976d2')),
-        name='BB Buy Signal',
-        showlegend=True
-    ), row=1, col=1)
-
-    # Sell Signals (Bollinger Bands)
-    sell_signals_bb = df[df['bb_sell_signal']]
-    fig.add_trace(go.Scatter(
-        x=sell_signals_bb.index,
-        y=sell_signals_bb['close'],
-        mode='markers',
-        marker=dict(symbol='x', size=10, color='#ff9800', line=dict(width=2, color='#f57c00')),
-        name='BB Sell Signal',
-        showlegend=True
-    ), row=1, col=1)
-
-    # RSI
-    fig.add_trace(go.Scatter(x=df.index, y=df['rsi'], name='RSI', line=dict(color='#673ab7', width=1)), row=2, col=1)
-    fig.add_hline(y=70, line_dash="dash", line_color="red", row=2, col=1)
-    fig.add_hline(y=30, line_dash="dash", line_color="green", row=2, col=1)
-
-    # Buy Signals (RSI)
-    buy_signals_rsi = df[df['rsi_buy_signal']]
-    fig.add_trace(go.Scatter(
-        x=buy_signals_rsi.index,
-        y=buy_signals_rsi['rsi'],
-        mode='markers',
-        marker=dict(symbol='triangle-up', size=10, color='#4caf50'), # Green
-        name='RSI Buy Signal',
-        showlegend=True
-    ), row=2, col=1)
-
-    # Sell Signals (RSI)
-    sell_signals_rsi = df[df['rsi_sell_signal']]
-    fig.add_trace(go.Scatter(
-        x=sell_signals_rsi.index,
-        y=sell_signals_rsi['rsi'],
-        mode='markers',
-        marker=dict(symbol='triangle-down', size=10, color='#f44336'), # Red
-        name='RSI Sell Signal',
-        showlegend=True
-    ), row=2, col=1)
-
-    # MACD
-    fig.add_trace(go.Scatter(x=df.index, y=df['macd'], name='MACD', line=dict(color='#009688', width=1)), row=2, col=1)
-    fig.add_trace(go.Scatter(x=df.index, y=df['macd_signal'], name='Signal Line', line=dict(color='#ffc107', width=1)), row=2, col=1)
-    fig.add_trace(go.Bar(x=df.index, y=df['macd_histogram'], name='MACD Histogram', marker_color='#9e9e9e'), row=2, col=1)
-
-    # Buy Signals (MACD)
-    buy_signals_macd = df[df['macd_buy_signal']]
-    fig.add_trace(go.Scatter(
-        x=buy_signals_macd.index,
-        y=buy_signals_macd['macd'],
-        mode='markers',
-        marker=dict(symbol='circle', size=10, color='#4caf50'), # Green
-        name='MACD Buy Signal',
-        showlegend=True
-    ), row=2, col=1)
-
-    # Sell Signals (MACD)
-    sell_signals_macd = df[df['macd_sell_signal']]
-    fig.add_trace(go.Scatter(
-        x=sell_signals_macd.index,
-        y=sell_signals_macd['macd'],
-        mode='markers',
-        marker=dict(symbol='x', size=10, color='#f44336'), # Red
-        name='MACD Sell Signal',
-        showlegend=True
-    ), row=2, col=1)
+    traces.append((go.Scattergl(x=index, y=arrs['upper_band'], name='Upper Band', line=dict(color='#4caf50', width=1, dash='dash')), 1))
+    traces.append((go.Scattergl(x=index, y=arrs['middle_band'], name='Middle Band', line=dict(color='#ffeb3b', width=1)), 1))
+    traces.append((go.Scattergl(x=index, y=arrs['lower_band'], name='Lower Band', line=dict(color='#f44336', width=1, dash='dash')), 1))
+
+    # RSI and MACD
+    traces.append((go.Scattergl(x=index, y=arrs['rsi'], name='RSI', line=dict(color='#673ab7', width=1)), 2))
+    traces.append((go.Scattergl(x=index, y=arrs['macd'], name='MACD', line=dict(color='#009688', width=1)), 2))
+    traces.append((go.Scattergl(x=index, y=arrs['macd_signal'], name='Signal Line', line=dict(color='#ffc107', width=1)), 2))
+    traces.append((go.Bar(x=index, y=arrs['macd_histogram'], name='MACD Histogram', marker_color='#9e9e9e'), 2))
 
     # Stochastic Oscillator
-    fig.add_trace(go.Scatter(x=df.index, y=df['%K'], name='%K', line=dict(color='#03a9f4', width=1)), row=3, col=1)
-    fig.add_trace(go.Scatter(x=df.index, y=df['%D'], name='%D', line=dict(color='#ff5722', width=1)), row=3, col=1)
-    fig.add_hline(y=80, line_dash="dash", line_color="red", row=3, col=1)
-    fig.add_hline(y=20, line_dash="dash", line_color="green", row=3, col=1)
-
-    # Buy Signals (Stochastic Oscillator)
-    buy_signals_stoch = df[df['stoch_buy_signal']]
-    fig.add_trace(go.Scatter(
-        x=buy_signals_stoch.index,
-        y=buy_signals_stoch['%K'],
-        mode='markers',
-        marker=dict(symbol='triangle-up', size=10, color='#4caf50'), # Green
-        name='Stoch Buy Signal',
-        showlegend=True
-    ), row=3, col=1)
-
-    # Sell Signals (Stochastic Oscillator)
-    sell_signals_stoch = df[df['stoch_sell_signal']]
-    fig.add_trace(go.Scatter(
-        x=sell_signals_stoch.index,
-        y=sell_signals_stoch['%K'],
-        mode='markers',
-        marker=dict(symbol='triangle-down', size=10, color='#f44336'), # Red
-        name='Stoch Sell Signal',
-        showlegend=True
-    ), row=3, col=1)
-
-    # Combined Signals
-    fig.add_trace(go.Scatter(
-        x=df.index[df['strong_buy_signal']],
-        y=df['close'][df['strong_buy_signal']],
-        mode='markers',
-        marker=dict(symbol='star', size=12, color='#00c853'), # Dark Green
-        name='Strong Buy',
-        showlegend=True
-    ), row=1, col=1)
-
-    fig.add_trace(go.Scatter(
-        x=df.index[df['strong_sell_signal']],
-        y=df['close'][df['strong_sell_signal']],
-        mode='markers',
-        marker=dict(symbol='star', size=12, color='#d50000'), # Dark Red
-        name='Strong Sell',
-        showlegend=True
-    ), row=1, col=1)
+    traces.append((go.Scattergl(x=index, y=arrs['%K'], name='%K', line=dict(color='#03a9f4', width=1)), 3))
+    traces.append((go.Scattergl(x=index, y=arrs['%D'], name='%D', line=dict(color='#ff5722', width=1)), 3))
+
+    # Trade signals: one marker trace per subplot row
+    traces.extend(_signal_traces(index, arrs))
+
+    fig.add_traces([trace for trace, _ in traces],
+                   rows=[row for _, row in traces],
+                   cols=[1] * len(traces))
 
     fig.update_layout(
         title=f'{symbol} Stock Analysis',
@@ -193,7 +171,8 @@ def plot_stock_data(df: pd.DataFrame, symbol: str):
         xaxis_rangeslider_visible=False,
         template='plotly_white', # Use a clean white template
         hovermode='x unified',
-        height=900 # Set overall figure height
+        height=900, # Set overall figure height
+        shapes=_GUIDE_SHAPES
     )
 
-    return fig
\ No newline at end of file
+    return fig
@@ -1,124 +1,406 @@
-import requests
+import asyncio
+import atexit
+import functools
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+
+import httpx
 import pandas as pd
-from io import StringIO
+import pyarrow as pa
+from pyarrow import csv as pacsv
+from io import BytesIO, StringIO
 import yfinance as yf
 import os
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 import json # Import json module
 from src.config import get_alpha_vantage_api_key
 
 CACHE_DIR = 'cache'
+MANIFEST_FILE = os.path.join(CACHE_DIR, 'manifest.json')
 
-def get_daily_data(symbol: str, api_key: str) -> pd.DataFrame:
+# Write-time metadata for the per-symbol Parquet cache, keyed by symbol with
+# {'mtime': ..., 'rows': ...}. Freshness checks become a dict lookup instead
+# of an os.path.getmtime stat per symbol. The lock serializes mutation and
+# serialization of the shared dict: distinct symbols save concurrently during
+# a pre-warm, and json.dump iterating the dict while another thread inserts
+# would raise "dictionary changed size during iteration".
+_manifest = None
+_manifest_lock = threading.Lock()
+
+# One process-wide HTTP client: keep-alive plus HTTP/2 multiplexing amortizes
+# the TLS handshake across calls instead of paying it per request.
+_http_client = httpx.Client(http2=True, timeout=15.0,
+                            limits=httpx.Limits(max_keepalive_connections=4,
+                                                max_connections=8))
+atexit.register(_http_client.close)
+
+# Full set of listed tickers, loaded once per process from the Alpha Vantage
+# LISTING_STATUS endpoint (with a 24h disk cache) so symbol validation is an
+# O(1) set lookup instead of a per-click HTTP round-trip.
+_symbol_universe = None
+
+def get_symbol_universe(api_key: str) -> frozenset:
     """
-    Fetches daily time series data for a given stock symbol, trying Alpha Vantage first,
-    then falling back to yfinance if Alpha Vantage fails. Uses a local cache.
+    Returns the set of currently listed stock symbols.
+
+    Fetched from Alpha Vantage's LISTING_STATUS CSV at most once every 24
+    hours (cached on disk), and held in memory for the rest of the process.
 
     Args:
-        symbol: The stock symbol (e.g., 'AAPL').
         api_key: Your Alpha Vantage API key.
 
     Returns:
-        A pandas DataFrame with the daily time series data.
+        A frozenset of upper-case symbols, or an empty frozenset if the
+        listing could not be fetched.
     """
+    global _symbol_universe
+    if _symbol_universe is not None:
+        return _symbol_universe
+
     if not os.path.exists(CACHE_DIR):
         os.makedirs(CACHE_DIR)
 
-    cache_file = os.path.join(CACHE_DIR, f'{symbol}.csv')
+    cache_file = os.path.join(CACHE_DIR, 'symbol_universe.csv')
 
-    # Try loading from cache first
+    csv_text = None
     if os.path.exists(cache_file):
         file_mod_time = datetime.fromtimestamp(os.path.getmtime(cache_file))
         if datetime.now() - file_mod_time < timedelta(hours=24):
-            print(f"Loading data for {symbol} from cache.")
-            try:
-                df = pd.read_csv(cache_file, index_col='timestamp', parse_dates=True)
-                # Basic validation: check if 'close' column exists
-                if 'close' in df.columns:
-                    return df
-                else:
-                    print(f"Cached data for {symbol} is invalid (missing 'close' column). Re-fetching.")
-            except Exception as e:
-                print(f"Error reading from cache for {symbol}: {e}. Re-fetching data.")
-                # If cache read fails, proceed to fetch new data
-
-    df = pd.DataFrame() # Initialize empty DataFrame
-
-    # Try Alpha Vantage
+            print("Loading symbol universe from cache.")
+            with open(cache_file, 'r') as f:
+                csv_text = f.read()
+
+    if csv_text is None:
+        try:
+            print("Fetching symbol universe from Alpha Vantage API.")
+            url = f'https://www.alphavantage.co/query?function=LISTING_STATUS&apikey={api_key}'
+            response = _http_client.get(url)
+            response.raise_for_status()
+            csv_text = response.text
+            with open(cache_file, 'w') as f:
+                f.write(csv_text)
+        except Exception as e:
+            print(f"Failed to fetch symbol universe: {e}")
+            return frozenset()
+
     try:
-        print(f"Fetching data for {symbol} from Alpha Vantage API.")
-        url = f'https://www.alphavantage.co/query?function=TIME_SERIES_DAILY&symbol={symbol}&apikey={api_key}&datatype=csv'
-        response = requests.get(url)
-        response.raise_for_status()  # Raise an exception for bad status codes
-
-        # Check for Alpha Vantage API error messages in the response text
-        # This is crucial to prevent parsing JSON errors as CSV
-        if response.text.startswith('{') and response.text.endswith('}'):
-            try:
-                json_data = json.loads(response.text)
-                if "Error Message" in json_data or "Information" in json_data:
-                    raise ValueError(f"Alpha Vantage API error: {json_data}")
-                # If it's JSON but not a known error, it might be valid data in JSON format
-                # For TIME_SERIES_DAILY, we expect CSV, so treat unexpected JSON as error
-                raise ValueError(f"Alpha Vantage returned unexpected JSON: {json_data}")
-            except json.JSONDecodeError:
-                # Not valid JSON, proceed as CSV
-                pass
-
-        csv_file = StringIO(response.text)
-        df = pd.read_csv(csv_file)
-        
-        # Alpha Vantage specific column renaming
-        column_mapping = {
-            '1. open': 'open',
-            '2. high': 'high',
-            '3. low': 'low',
-            '4. close': 'close',
-            '5. volume': 'volume',
-            'timestamp': 'timestamp'
-        }
-        df = df.rename(columns={k: v for k, v in column_mapping.items() if k in df.columns})
-
-        df['timestamp'] = pd.to_datetime(df['timestamp'])
-        df = df.set_index('timestamp')
-        print(f"Successfully fetched data for {symbol} from Alpha Vantage.")
+        df = pd.read_csv(StringIO(csv_text))
+        _symbol_universe = frozenset(df['symbol'].astype(str).str.upper())
+    except Exception as e:
+        print(f"Failed to parse symbol universe: {e}")
+        return frozenset()
+
+    return _symbol_universe
 
+def _load_manifest() -> dict:
+    """Loads the cache manifest from disk once, returning an empty dict if absent."""
+    global _manifest
+    if _manifest is None:
+        with _manifest_lock:
+            if _manifest is None:
+                try:
+                    with open(MANIFEST_FILE, 'r') as f:
+                        _manifest = json.load(f)
+                except (OSError, json.JSONDecodeError):
+                    _manifest = {}
+    return _manifest
+
+def _write_manifest():
+    """Writes the manifest via a temp file plus os.replace; the rename is
+    atomic, so concurrent or crashed writes never leave a truncated
+    manifest.json on disk. The caller holds _manifest_lock."""
+    tmp = MANIFEST_FILE + '.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(_manifest, f)
+    os.replace(tmp, MANIFEST_FILE)
+
+def _load_cached(symbol: str):
+    """
+    Loads the cached daily data for a symbol, or None if absent/stale/invalid.
+    """
+    entry = _load_manifest().get(symbol)
+    if entry is None:
+        return None
+
+    file_mod_time = datetime.fromtimestamp(entry['mtime'])
+    if datetime.now() - file_mod_time >= timedelta(hours=24):
+        return None
+
+    cache_file = os.path.join(CACHE_DIR, f'{symbol}.parquet')
+    print(f"Loading data for {symbol} from cache.")
+    try:
+        # Parquet keeps the datetime index and column dtypes, so there is no
+        # parse_dates reparse on the hit path like there was with CSV.
+        df = pd.read_parquet(cache_file)
+        # Basic validation: check if 'close' column exists
+        if 'close' in df.columns:
+            return df
+        print(f"Cached data for {symbol} is invalid (missing 'close' column). Re-fetching.")
     except Exception as e:
-        print(f"Alpha Vantage failed for {symbol}: {e}. Falling back to yfinance...")
+        print(f"Error reading from cache for {symbol}: {e}. Re-fetching data.")
+        # If cache read fails, proceed to fetch new data
+    return None
 
-    # Fallback to yfinance if Alpha Vantage failed or returned empty data
-    if df.empty:
+# Arrow schema for the TIME_SERIES_DAILY CSV as Alpha Vantage names it.
+_AV_COLUMN_TYPES = {
+    'timestamp': pa.timestamp('ns'),
+    '1. open': pa.float32(),
+    '2. high': pa.float32(),
+    '3. low': pa.float32(),
+    '4. close': pa.float32(),
+    '5. volume': pa.int64(),
+}
+
+def _parse_av_csv(body: bytes) -> pd.DataFrame:
+    """
+    Parses an Alpha Vantage TIME_SERIES_DAILY CSV body into a DataFrame.
+
+    Works on the raw response bytes: a CSV body always starts with a header
+    ('timestamp,...'), so one first-byte sniff decides JSON-vs-CSV without
+    the full UTF-8 decode that response.text would pay on every call.
+
+    Raises ValueError if the body is actually a JSON error/notice payload.
+    """
+    # Check for Alpha Vantage API error messages in the response body
+    # This is crucial to prevent parsing JSON errors as CSV
+    if body[:1] == b'{':
         try:
-            print(f"Attempting to fetch data for {symbol} from yfinance...")
-            df = yf.download(symbol, period="1y") # Download 1 year of data
-            if df.empty:
-                raise ValueError("yfinance returned empty data.")
-
-            # Flatten MultiIndex columns if present
-            if isinstance(df.columns, pd.MultiIndex):
-                df.columns = [col[0] for col in df.columns.values] # Take only the first element of the tuple
-
-            # Rename columns to match expected format (lowercase)
-            df.columns = [col.lower() for col in df.columns]
-            df = df.rename(columns={'adj close': 'close'}) # Adjust 'adj close' to 'close'
-            
-            # Ensure 'timestamp' is the index
-            df.index.name = 'timestamp'
+            json_data = json.loads(body)
+            if "Error Message" in json_data or "Information" in json_data:
+                raise ValueError(f"Alpha Vantage API error: {json_data}")
+            # If it's JSON but not a known error, it might be valid data in JSON format
+            # For TIME_SERIES_DAILY, we expect CSV, so treat unexpected JSON as error
+            raise ValueError(f"Alpha Vantage returned unexpected JSON: {json_data}")
+        except json.JSONDecodeError:
+            # Not valid JSON, proceed as CSV
+            pass
+
+    # pyarrow's CSV reader parses in parallel C++ threads, and typing the
+    # timestamp column up front means no pd.to_datetime reparse afterwards.
+    table = pacsv.read_csv(
+        BytesIO(body),
+        convert_options=pacsv.ConvertOptions(column_types=_AV_COLUMN_TYPES))
+    df = table.to_pandas(self_destruct=True)
+
+    # Alpha Vantage specific column renaming
+    column_mapping = {
+        '1. open': 'open',
+        '2. high': 'high',
+        '3. low': 'low',
+        '4. close': 'close',
+        '5. volume': 'volume',
+        'timestamp': 'timestamp'
+    }
+    df = df.rename(columns={k: v for k, v in column_mapping.items() if k in df.columns})
+
+    df = df.set_index('timestamp')
+    return df
+
+async def _fetch_av(client, symbol: str, api_key: str) -> pd.DataFrame:
+    """
+    Fetches one symbol's daily CSV from Alpha Vantage on the shared client.
+
+    The CSV parse runs in a worker thread so it never blocks the event loop.
+    """
+    print(f"Fetching data for {symbol} from Alpha Vantage API.")
+    url = f'https://www.alphavantage.co/query?function=TIME_SERIES_DAILY&symbol={symbol}&apikey={api_key}&datatype=csv'
+    response = await client.get(url)
+    response.raise_for_status()  # Raise an exception for bad status codes
+    df = await asyncio.to_thread(_parse_av_csv, response.content)
+    print(f"Successfully fetched data for {symbol} from Alpha Vantage.")
+    return df
+
+def _fetch_yfinance(symbol: str) -> pd.DataFrame:
+    """
+    Fetches one symbol's daily data from yfinance; empty DataFrame on failure.
+    """
+    try:
+        print(f"Attempting to fetch data for {symbol} from yfinance...")
+        df = yf.download(symbol, period="1y") # Download 1 year of data
+        if df.empty:
+            raise ValueError("yfinance returned empty data.")
+
+        # Flatten MultiIndex columns if present
+        if isinstance(df.columns, pd.MultiIndex):
+            df.columns = [col[0] for col in df.columns.values] # Take only the first element of the tuple
+
+        # Rename columns to match expected format (lowercase)
+        df.columns = [col.lower() for col in df.columns]
+        df = df.rename(columns={'adj close': 'close'}) # Adjust 'adj close' to 'close'
+
+        # Ensure 'timestamp' is the index; yf.download already returns a
+        # DatetimeIndex, so only reparse (an O(N) copy) if it somehow isn't.
+        df.index.name = 'timestamp'
+        if not isinstance(df.index, pd.DatetimeIndex):
             df.index = pd.to_datetime(df.index)
 
-            print(f"Successfully fetched data for {symbol} from yfinance.")
+        print(f"Successfully fetched data for {symbol} from yfinance.")
+        return df
 
-        except Exception as e:
-            print(f"yfinance failed for {symbol}: {e}.")
-            df = pd.DataFrame() # Ensure df is empty on failure
+    except Exception as e:
+        print(f"yfinance failed for {symbol}: {e}.")
+        return pd.DataFrame() # Ensure df is empty on failure
 
-    # Save to cache if data was successfully fetched from either source and is valid
+def _fetch_yfinance_many(symbols) -> dict:
+    """
+    Fetches several symbols from yfinance in parallel worker threads.
+
+    yfinance is sync-only but releases the GIL while waiting on the network,
+    so a small thread pool overlaps the per-symbol round-trips instead of
+    retrying each failed symbol serially.
+    """
+    results = {}
+    with ThreadPoolExecutor(max_workers=min(8, len(symbols))) as executor:
+        futures = {executor.submit(_fetch_yfinance, symbol): symbol for symbol in symbols}
+        for future in as_completed(futures):
+            results[futures[future]] = future.result()
+    return results
+
+def _save_cache(symbol: str, df: pd.DataFrame):
+    """Caches the DataFrame to disk if it was fetched successfully and is valid."""
     if not df.empty and 'close' in df.columns:
-        with open(cache_file, 'w') as f:
-            df.to_csv(f, index=True) # Save the processed DataFrame to CSV, with index
+        cache_file = os.path.join(CACHE_DIR, f'{symbol}.parquet')
+        df.to_parquet(cache_file, engine='pyarrow', compression='zstd')
+        manifest = _load_manifest()
+        with _manifest_lock:
+            manifest[symbol] = {'mtime': os.path.getmtime(cache_file), 'rows': len(df)}
+            _write_manifest()
+
+async def get_daily_data_many(symbols, api_key: str) -> dict:
+    """
+    Fetches daily time series data for many symbols concurrently.
+
+    Cache hits are served from disk; the remaining Alpha Vantage requests all
+    go out together over one shared connection pool via asyncio.gather, so
+    wall-clock time is ~one round-trip instead of one per symbol. Symbols
+    Alpha Vantage fails on fall back to yfinance individually.
+
+    Args:
+        symbols: The stock symbols to fetch.
+        api_key: Your Alpha Vantage API key.
+
+    Returns:
+        A dict mapping each symbol to its DataFrame (empty on total failure).
+    """
+    if not os.path.exists(CACHE_DIR):
+        os.makedirs(CACHE_DIR)
+
+    results = {}
+    pending = []
+    for symbol in symbols:
+        df = _load_cached(symbol)
+        if df is not None:
+            results[symbol] = df
+        else:
+            pending.append(symbol)
+
+    if pending:
+        async with httpx.AsyncClient(http2=True, timeout=15.0,
+                                     limits=httpx.Limits(max_connections=8)) as client:
+            fetched = await asyncio.gather(
+                *(_fetch_av(client, symbol, api_key) for symbol in pending),
+                return_exceptions=True)
+
+        fallback = []
+        for symbol, df in zip(pending, fetched):
+            if isinstance(df, Exception):
+                print(f"Alpha Vantage failed for {symbol}: {df}. Falling back to yfinance...")
+                fallback.append(symbol)
+            elif df.empty:
+                fallback.append(symbol)
+            else:
+                _save_cache(symbol, df)
+                results[symbol] = df
+
+        # All Alpha Vantage misses hit yfinance together rather than one at a
+        # time; the pool runs off the event loop via to_thread.
+        if fallback:
+            fetched_yf = await asyncio.to_thread(_fetch_yfinance_many, fallback)
+            for symbol, df in fetched_yf.items():
+                _save_cache(symbol, df)
+                results[symbol] = df
+
+    return results
+
+# In-flight fetches keyed by (symbol, day). Concurrent callers for the same
+# key share one Future and a single network fetch runs between them
+# (single-flight), while different symbols proceed in parallel rather than
+# queueing behind one global lock.
+_inflight = {}
+_inflight_lock = threading.Lock()
+
+def _single_flight(key, work):
+    """
+    Runs work() once per key, sharing the result with concurrent callers.
 
+    The first caller for a key becomes the owner and executes work(); any
+    caller arriving while it runs blocks on the same Future and receives the
+    owner's result (or exception) instead of starting a duplicate fetch.
+    """
+    with _inflight_lock:
+        fut = _inflight.get(key)
+        if fut is None:
+            fut = Future()
+            _inflight[key] = fut
+            owner = True
+        else:
+            owner = False
+
+    if not owner:
+        return fut.result()
+
+    try:
+        result = work()
+        fut.set_result(result)
+        return result
+    except BaseException as e:
+        fut.set_exception(e)
+        raise
+    finally:
+        with _inflight_lock:
+            _inflight.pop(key, None)
+
+class _FetchFailedError(Exception):
+    """Raised inside the memo layer so failed fetches are never cached."""
+
+@functools.lru_cache(maxsize=256)
+def _daily_data_cached(symbol: str, api_key: str, day: str) -> pd.DataFrame:
+    """
+    In-memory layer over the disk cache, keyed by (symbol, api_key, day).
+
+    The day component rolls the key over automatically on a new trading day;
+    within a day, repeat calls skip both the Parquet read and the network.
+
+    Raises _FetchFailedError when both sources came back empty: lru_cache
+    does not store results of calls that raise, so a transient outage is
+    retried on the next call rather than pinned for the rest of the day.
+    """
+    df = _single_flight(
+        (symbol, day),
+        lambda: asyncio.run(get_daily_data_many([symbol], api_key)))[symbol]
+    if df.empty:
+        raise _FetchFailedError(symbol)
     return df
 
+def get_daily_data(symbol: str, api_key: str) -> pd.DataFrame:
+    """
+    Fetches daily time series data for a given stock symbol, trying Alpha Vantage first,
+    then falling back to yfinance if Alpha Vantage fails. Uses a local cache, held
+    in memory for the rest of the day once loaded.
+
+    Args:
+        symbol: The stock symbol (e.g., 'AAPL').
+        api_key: Your Alpha Vantage API key.
+
+    Returns:
+        A pandas DataFrame with the daily time series data (empty if both
+        sources failed; the failure itself is not cached).
+    """
+    try:
+        return _daily_data_cached(symbol, api_key, str(date.today()))
+    except _FetchFailedError:
+        return pd.DataFrame()
+
 if __name__ == '__main__':
     api_key = get_alpha_vantage_api_key()
     symbol = 'MSFT'
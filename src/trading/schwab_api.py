@@ -1,101 +1,363 @@
 from schwab.auth import easy_client
 from src.config import get_schwab_api_credentials
-from schwab.client import Client
 from datetime import datetime, timedelta, date # Import date
+import asyncio
+import httpx
 import json
+import logging
+import numpy as np
+import pandas as pd
+import pyarrow as pa
 import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from operator import itemgetter
+
+# orjson's C encoder/decoder is several times faster than stdlib json on the
+# 10k+ row trade-history cache and emits bytes directly; fall back to the
+# stdlib if it is unavailable.
+try:
+    import orjson
+    _loads = orjson.loads
+    _dumps = orjson.dumps
+except ImportError:
+    _loads = json.loads
+    def _dumps(obj):
+        return json.dumps(obj, separators=(',', ':')).encode()
+
+# ijson stream-parses one record at a time, so loading a multi-year
+# monolithic history never holds the raw bytes and the fully parsed tree in
+# memory together. Optional like orjson; the eager parser is the fallback.
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+SCHWAB_API_BASE_URL = 'https://api.schwabapi.com'
+
+# Debug-only dumps of full transaction/position payloads go through the
+# logging module so they cost nothing unless DEBUG is enabled (stringifying
+# thousands of dicts into a print is pure overhead on the hot path).
+_logger = logging.getLogger(__name__)
 
 SCHWAB_CACHE_DIR = 'schwab_cache'
+# Trade history is sharded into one file per account under this directory,
+# so an incremental fetch rewrites only the accounts that actually changed.
+TRADE_HISTORY_DIR = os.path.join(SCHWAB_CACHE_DIR, 'trade_history')
+# Create the cache directories once at import; exist_ok makes each a single
+# race-free syscall, and the per-call existence checks go away entirely.
+os.makedirs(TRADE_HISTORY_DIR, exist_ok=True)
+
+# The authenticated client and the account hashValues it resolves are both
+# stable for the life of the process, so build them once instead of paying an
+# OAuth token read plus a get_account_numbers round-trip on every call.
+_client = None
+_client_lock = threading.Lock()
+_account_ids = None
+_account_ids_lock = threading.Lock()
+
+# In-memory memo for get_positions so per-keystroke dashboard callbacks don't
+# re-read the cache file (or re-hit the API) more than once every 30 seconds.
+# Once populated, stale entries are served immediately while one background
+# thread revalidates (stale-while-revalidate); the lock guarantees at most
+# one in-flight refresh regardless of callback fan-out.
+_POSITIONS_MEMO_TTL_SECONDS = 30
+_positions_memo = {'fetched_at': 0.0, 'positions': None}
+_positions_refresh_lock = threading.Lock()
+
+# Disk-cache freshness: inside the TTL the file is served as-is; inside the
+# stale window it is still served but a background thread revalidates.
+_POSITIONS_CACHE_TTL = timedelta(minutes=5)
+_POSITIONS_STALE_WINDOW = timedelta(minutes=10)
+
+# In-flight request registry for single-flight dispatch: concurrent callers
+# asking for the same key wait on the first caller's Future instead of each
+# fetching (and racing to rewrite the same cache file).
+_inflight = {}
+_inflight_lock = threading.Lock()
+
+def _single_flight(key, work):
+    """
+    Runs work() once per key at a time; concurrent callers share the result.
 
-def _get_schwab_client():
-    credentials = get_schwab_api_credentials()
-    if not credentials:
-        print("Schwab API credentials not found. Please run scripts/authenticate_schwab.py")
-        return None
-
-    client = easy_client(
-        api_key=credentials['api_key'],
-        app_secret=credentials['app_secret'],
-        callback_url=credentials['redirect_uri'],
-        token_path="token.json"
-    )
-    return client
+    The first caller for a key executes work and resolves a Future; callers
+    arriving while it is in flight block on that Future and get the same
+    result (or exception) without duplicating the API calls.
+    """
+    with _inflight_lock:
+        fut = _inflight.get(key)
+        if fut is not None:
+            owner = False
+        else:
+            fut = Future()
+            _inflight[key] = fut
+            owner = True
+
+    if not owner:
+        return fut.result()
+
+    try:
+        result = work()
+    except Exception as e:
+        fut.set_exception(e)
+        raise
+    else:
+        fut.set_result(result)
+        return result
+    finally:
+        with _inflight_lock:
+            _inflight.pop(key, None)
 
-def get_positions():
+def _write_cache_atomic(cache_file, data):
     """
-    Fetches the account positions from the Schwab API, with caching.
+    Serializes data to cache_file via a temp file plus os.replace.
+
+    open(..., 'wb') truncates in place, so a crash mid-write would corrupt
+    the cache and force a full Schwab re-fetch; the rename is atomic.
     """
-    if not os.path.exists(SCHWAB_CACHE_DIR):
-        os.makedirs(SCHWAB_CACHE_DIR)
+    tmp = cache_file + '.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(_dumps(data))
+    os.replace(tmp, cache_file)
 
-    cache_file = os.path.join(SCHWAB_CACHE_DIR, 'positions.json')
-    
-    # Try loading from cache first
-    if os.path.exists(cache_file):
-        file_mod_time = datetime.fromtimestamp(os.path.getmtime(cache_file))
-        if datetime.now() - file_mod_time < timedelta(minutes=5): # Cache for 5 minutes
-            print("Loading positions from Schwab cache.")
-            with open(cache_file, 'r') as f:
-                return json.load(f)
+def _get_schwab_client():
+    global _client
+    with _client_lock:
+        if _client is None:
+            credentials = get_schwab_api_credentials()
+            if not credentials:
+                print("Schwab API credentials not found. Please run scripts/authenticate_schwab.py")
+                return None
+
+            _client = easy_client(
+                api_key=credentials['api_key'],
+                app_secret=credentials['app_secret'],
+                callback_url=credentials['redirect_uri'],
+                token_path="token.json"
+            )
+            # schwab-py builds its httpx session without HTTP/2. Swapping in
+            # an HTTP/2 transport lets the concurrent per-account requests
+            # multiplex as parallel streams over one TLS connection instead
+            # of paying a handshake per worker thread. The OAuth layer sits
+            # above the transport, so token handling is untouched.
+            try:
+                _client.session._transport = httpx.HTTPTransport(
+                    http2=True,
+                    limits=httpx.Limits(max_connections=10,
+                                        max_keepalive_connections=10))
+            except Exception as e:
+                print(f"Could not enable HTTP/2 on the Schwab session: {e}")
+        return _client
+
+def _get_account_ids():
+    """
+    Resolves the account hashValues once per process.
 
+    Returns a list of hashValue strings, or an empty list if the client is
+    unavailable or the lookup fails (the failure is not memoized, so a later
+    call retries).
+    """
+    global _account_ids
     client = _get_schwab_client()
     if not client:
         return []
 
+    with _account_ids_lock:
+        if _account_ids is None:
+            account_numbers_response = client.get_account_numbers()
+            if not account_numbers_response.is_success:
+                print("Error fetching account numbers:", account_numbers_response.text)
+                return []
+
+            all_schwab_accounts = account_numbers_response.json()
+            if not all_schwab_accounts:
+                print("No accounts found.")
+                return []
+
+            _account_ids = [account['hashValue'] for account in all_schwab_accounts]
+        return _account_ids
+
+def _get_bearer_token():
+    """Returns a valid OAuth access token from the cached client, or None.
+
+    The raw httpx.AsyncClient used for the positions fan-out bypasses the
+    authlib session, so the session's auto-refresh has to be driven
+    explicitly here — Schwab access tokens expire after ~30 minutes.
+    """
     client = _get_schwab_client()
     if not client:
-        return []
+        return None
+    try:
+        if not client.session.ensure_active_token():
+            print("Schwab access token expired and could not be refreshed.")
+            return None
+    except Exception as e:
+        print(f"Error refreshing Schwab access token: {e}")
+        return None
+    return client.session.token['access_token']
 
-    account_numbers_response = client.get_account_numbers()
-    if not account_numbers_response.is_success:
-        print("Error fetching account numbers:", account_numbers_response.text)
+async def _fetch_account_positions(client, account_id: str):
+    """Fetches one account's positions payload on the shared async client."""
+    response = await client.get(f'/trader/v1/accounts/{account_id}',
+                                params={'fields': 'positions'})
+    response.raise_for_status()
+    return response.json()
+
+async def get_positions_async(force_refresh=False):
+    """
+    Fetches the account positions from the Schwab API, with caching.
+
+    The per-account requests all go out together over one httpx.AsyncClient
+    reusing the easy_client OAuth bearer token, so wall-clock time stays at
+    ~one round-trip however many accounts there are.
+
+    A disk cache younger than the 5-minute TTL is served directly; one
+    inside the 10-minute stale window after that is still served, with a
+    background thread revalidating, so only a cold or long-expired cache
+    blocks on the Schwab round-trip. force_refresh skips both the memo and
+    the disk cache — it is what the background revalidation uses.
+    """
+    cache_file = os.path.join(SCHWAB_CACHE_DIR, 'positions.json')
+
+    if not force_refresh:
+        # Serve from the in-memory memo while it is fresh
+        if _positions_memo['positions'] is not None and \
+                time.monotonic() - _positions_memo['fetched_at'] < _POSITIONS_MEMO_TTL_SECONDS:
+            return _positions_memo['positions']
+
+        # Try loading from cache first
+        if os.path.exists(cache_file):
+            file_mod_time = datetime.fromtimestamp(os.path.getmtime(cache_file))
+            age = datetime.now() - file_mod_time
+            if age < _POSITIONS_CACHE_TTL + _POSITIONS_STALE_WINDOW:
+                print("Loading positions from Schwab cache.")
+                with open(cache_file, 'rb') as f:
+                    positions = _loads(f.read())
+                _positions_memo['positions'] = positions
+                _positions_memo['fetched_at'] = time.monotonic()
+                if age >= _POSITIONS_CACHE_TTL \
+                        and _positions_refresh_lock.acquire(blocking=False):
+                    # Stale but servable: hand it back now, refresh behind it
+                    threading.Thread(target=_refresh_positions, daemon=True).start()
+                return positions
+
+    token = _get_bearer_token()
+    if not token:
         return []
-    
-    all_schwab_accounts = account_numbers_response.json()
-    if not all_schwab_accounts:
-        print("No accounts found.")
+
+    account_ids = _get_account_ids()
+    if not account_ids:
         return []
 
     all_formatted_positions = []
     as_of_timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
 
-    for account in all_schwab_accounts:
-        account_id = account['hashValue']
-        print(f"Fetching positions for account: {account_id}")
-
-        response = client.get_account(account_id, fields=[Client.Account.Fields.POSITIONS])
-        if not response.is_success:
-            print(f"Error fetching positions for account {account_id}:", response.text)
+    print(f"Fetching positions for accounts: {', '.join(account_ids)}")
+    async with httpx.AsyncClient(base_url=SCHWAB_API_BASE_URL,
+                                 headers={'Authorization': f'Bearer {token}'}) as client:
+        fetched = await asyncio.gather(
+            *(_fetch_account_positions(client, account_id) for account_id in account_ids),
+            return_exceptions=True)
+
+    # Collect the raw positions across all accounts first, then flatten and
+    # derive the computed columns in one vectorized pandas pass instead of a
+    # per-position dict build with Python-level arithmetic.
+    raw = []
+    failures = 0
+    for account_id, account_data in zip(account_ids, fetched):
+        if isinstance(account_data, Exception):
+            print(f"Error fetching positions for account {account_id}:", account_data)
+            failures += 1
             continue # Continue to the next account if there's an error
-
-        account_data = response.json()
-        positions = account_data.get('securitiesAccount', {}).get('positions', [])
-        
-        for p in positions:
-            quantity = p['longQuantity'] if 'longQuantity' in p else p.get('shortQuantity', 0) * -1
-            market_value = p['marketValue']
-            current_price = market_value / quantity if quantity != 0 else 0
-
-            all_formatted_positions.append({
-                'account_id': account_id, # Add account_id to each position
-                'symbol': p['instrument']['symbol'],
-                'quantity': quantity,
-                'market_value': market_value,
-                'average_price': p.get('averagePrice', 0),
-                'current_price': current_price,
-                'as_of_timestamp': as_of_timestamp,
-            })
-            
-    # Save to cache
-    with open(cache_file, 'w') as f:
-        json.dump(all_formatted_positions, f, indent=4)
+        raw.extend((account_id, p) for p in
+                   account_data.get('securitiesAccount', {}).get('positions', []))
+
+    # Every account errored (expired token, outage): keep whatever the cache
+    # and memo already hold instead of overwriting them with an empty list
+    # that would blank the dashboard until the next successful refresh.
+    if failures == len(account_ids):
+        print("All account position fetches failed; keeping previous positions.")
+        return _positions_memo['positions'] or []
+
+    if raw:
+        df = pd.json_normalize([p for _, p in raw], sep='_')
+        for col in ('longQuantity', 'shortQuantity', 'averagePrice'):
+            if col not in df:
+                df[col] = 0.0
+        long_qty = df['longQuantity'].fillna(0).to_numpy()
+        short_qty = df['shortQuantity'].fillna(0).to_numpy()
+        # Same rule as the old per-row branch: long quantity when present,
+        # otherwise the negated short quantity.
+        quantity = np.where(long_qty != 0, long_qty, -short_qty)
+        market_value = df['marketValue'].to_numpy()
+        current_price = np.divide(market_value, quantity,
+                                  out=np.zeros(len(raw)), where=quantity != 0)
+        out = pd.DataFrame({
+            'account_id': [aid for aid, _ in raw],
+            'symbol': df['instrument_symbol'],
+            'quantity': quantity,
+            'market_value': market_value,
+            'average_price': df['averagePrice'].fillna(0),
+            'current_price': current_price,
+            'as_of_timestamp': as_of_timestamp,
+        })
+        # Arrow's to_pylist yields plain Python scalars (unlike
+        # to_dict('records'), whose numpy values the cache serializer
+        # would reject) and builds the row dicts in C.
+        all_formatted_positions = pa.Table.from_pandas(
+            out, preserve_index=False).to_pylist()
+
+
+    # Save to cache: one compact buffer, written atomically.
+    _write_cache_atomic(cache_file, all_formatted_positions)
+
+    _positions_memo['positions'] = all_formatted_positions
+    _positions_memo['fetched_at'] = time.monotonic()
 
     return all_formatted_positions
 
+def _refresh_positions():
+    """Background revalidation; the caller holds _positions_refresh_lock."""
+    try:
+        asyncio.run(get_positions_async(force_refresh=True))
+    except Exception as e:
+        print(f"Background positions refresh failed: {e}")
+    finally:
+        _positions_refresh_lock.release()
+
+def get_positions():
+    """
+    Synchronous wrapper around get_positions_async for callers without an
+    event loop (the Dash layouts).
+
+    Serves the last-known positions immediately and, when they are older
+    than the memo TTL, kicks off a single background refresh rather than
+    blocking the render on the Schwab round-trip. Only the very first call
+    of a process (no data yet) fetches synchronously.
+    """
+    positions = _positions_memo['positions']
+    if positions is not None:
+        if time.monotonic() - _positions_memo['fetched_at'] >= _POSITIONS_MEMO_TTL_SECONDS \
+                and _positions_refresh_lock.acquire(blocking=False):
+            threading.Thread(target=_refresh_positions, daemon=True).start()
+        return positions
+
+    # No data yet: fetch in the foreground, single-flight under the same lock
+    # so concurrent first renders share one request.
+    with _positions_refresh_lock:
+        if _positions_memo['positions'] is not None:
+            return _positions_memo['positions']
+        return asyncio.run(get_positions_async())
+
 def get_trade_history(start_date: str = None, end_date: str = None, account_id: str = None):
     """
     Fetches the trade history from the Schwab API, with incremental fetching and caching.
 
+    Concurrent identical calls (same arguments) are coalesced into a single
+    fetch via the in-flight registry, so simultaneous dashboard callbacks
+    can't duplicate the Schwab requests or race on the cache file.
+
     Args:
         start_date (str): Start date in YYYY-MM-DD format. Defaults to 1 year ago.
         end_date (str): End date in YYYY-MM-DD format. Defaults to today.
@@ -103,25 +365,71 @@ def get_trade_history(start_date: str = None, end_date: str = None, account_id:
     Returns:
         A list of dictionaries, where each dictionary represents a transaction.
     """
-    if not os.path.exists(SCHWAB_CACHE_DIR):
-        os.makedirs(SCHWAB_CACHE_DIR)
+    return _single_flight(('trades', account_id, start_date, end_date),
+                          lambda: _fetch_trade_history(start_date, end_date, account_id))
+
+def _parse_td(s):
+    """Parses the date part of an ISO-8601 trade date string.
 
-    cache_file = os.path.join(SCHWAB_CACHE_DIR, 'trade_history.json')
+    date.fromisoformat on the first 10 characters is about 10x faster than
+    the equivalent strptime call, which matters on the planning pass that
+    runs once per account.
+    """
+    return date.fromisoformat(s[:10])
+
+def _fetch_trade_history(start_date=None, end_date=None, account_id=None):
+    legacy_cache_file = os.path.join(SCHWAB_CACHE_DIR, 'trade_history.json')
     all_transactions = []
-    latest_cached_date = None
 
-    # Try loading existing trade history from cache
-    if os.path.exists(cache_file):
-        with open(cache_file, 'r') as f:
-            all_transactions = json.load(f)
-        if all_transactions:
-            # Find the latest date in cached transactions
-            latest_cached_date = max(datetime.strptime(t['trade_date'].split('T')[0], '%Y-%m-%d').date() for t in all_transactions if 'trade_date' in t and t['trade_date'])
-            print(f"Loaded {len(all_transactions)} transactions from cache. Latest date: {latest_cached_date}")
+    # Latest cached trade date per account, tracked as 'YYYY-MM-DD' strings —
+    # lexicographic order is chronological for ISO dates, so one pass of
+    # string comparisons replaces repeated strptime max() scans per account.
+    latest_by_acct = {}
 
-    client = _get_schwab_client()
-    if not client:
-        return []
+    # Identities of every cached transaction, built in the same load pass so
+    # deduplication later needs no second full scan over the cache.
+    existing_transaction_ids = set()
+
+    # Per-account transaction counts at load time; the save pass only
+    # rewrites shards whose count changed, so an incremental fetch touching
+    # one account no longer rewrites the whole multi-account history.
+    loaded_counts = {}
+
+    # Load the per-account shards; a pre-shard monolithic trade_history.json
+    # is read once and migrated into shards on save.
+    migrating = os.path.exists(legacy_cache_file)
+    if migrating:
+        # The monolithic file is the one unbounded input left (shards are
+        # per-account and small), so stream it record by record; use_float
+        # keeps numbers as floats rather than ijson's default Decimal, which
+        # the cache serializer would reject on the way back out.
+        with open(legacy_cache_file, 'rb') as f:
+            if ijson is not None:
+                all_transactions = list(ijson.items(f, 'item', use_float=True))
+            else:
+                all_transactions = _loads(f.read())
+    else:
+        for fname in sorted(os.listdir(TRADE_HISTORY_DIR)):
+            if fname.endswith('.json'):
+                with open(os.path.join(TRADE_HISTORY_DIR, fname), 'rb') as f:
+                    all_transactions.extend(_loads(f.read()))
+    if all_transactions:
+        for t in all_transactions:
+            # Normalize the sort keys so the final ordering pass can use a
+            # plain itemgetter without per-element .get fallbacks.
+            if t.get('trade_date') is None:
+                t['trade_date'] = ''
+            if t.get('account_id') is None:
+                t['account_id'] = ''
+            d = t['trade_date'][:10]
+            aid = t['account_id']
+            if d and (aid not in latest_by_acct or d > latest_by_acct[aid]):
+                latest_by_acct[aid] = d
+            if aid is not None and 'trade_date' in t and 'symbol' in t and 'quantity' in t:
+                existing_transaction_ids.add((aid, t['trade_date'], t['symbol'], t['quantity']))
+            loaded_counts[aid] = loaded_counts.get(aid, 0) + 1
+        latest_cached_date = max(latest_by_acct.values()) if latest_by_acct else None
+        print(f"Loaded {len(all_transactions)} transactions from cache. Latest date: {latest_cached_date}")
 
     client = _get_schwab_client()
     if not client:
@@ -152,15 +460,19 @@ def get_trade_history(start_date: str = None, end_date: str = None, account_id:
 
     newly_fetched_transactions = []
 
+    # First pass: work out each account's incremental date range without any
+    # network traffic, so the HTTP calls can then all run together.
+    fetch_plan = []
     for account in accounts_to_fetch:
         current_account_id = account['hashValue']
         print(f"Fetching transactions for account: {current_account_id}")
 
-        # Filter cached transactions for the current account
-        cached_transactions_for_account = [t for t in all_transactions if t.get('account_id') == current_account_id]
+        # Latest cached date for this account comes straight from the
+        # precomputed map; only that one string gets parsed to a date.
         latest_cached_date_for_account = None
-        if cached_transactions_for_account:
-            latest_cached_date_for_account = max(datetime.strptime(t['trade_date'].split('T')[0], '%Y-%m-%d').date() for t in cached_transactions_for_account if 'trade_date' in t and t['trade_date'])
+        latest_str = latest_by_acct.get(current_account_id)
+        if latest_str:
+            latest_cached_date_for_account = _parse_td(latest_str)
 
         # Determine fetch date range
         fetch_start_date_obj = None
@@ -169,26 +481,47 @@ def get_trade_history(start_date: str = None, end_date: str = None, account_id:
         elif not start_date:
             fetch_start_date_obj = (datetime.now() - timedelta(days=365)).date() # Default to 1 year if no cache
         else:
-            fetch_start_date_obj = datetime.strptime(start_date, '%Y-%m-%d').date()
+            fetch_start_date_obj = _parse_td(start_date)
 
         if not end_date:
             fetch_end_date_obj = datetime.now().date()
         else:
-            fetch_end_date_obj = datetime.strptime(end_date, '%Y-%m-%d').date()
+            fetch_end_date_obj = _parse_td(end_date)
 
         # Ensure fetch_start_date_obj is not in the future and within 1 year of end_date
         if fetch_start_date_obj > fetch_end_date_obj:
             print(f"Fetch start date is after end date for account {current_account_id}. No new data to fetch.")
             continue # Move to the next account
 
-        # Schwab API limit: date range must not be more than a year
-        if (fetch_end_date_obj - fetch_start_date_obj).days > 365:
-            print(f"Adjusting fetch range for Schwab API limit for account {current_account_id}: {fetch_start_date_obj} to {fetch_end_date_obj}. Max 1 year.")
-            # For simplicity, fetch only the last year if range is too wide
-            fetch_start_date_obj = fetch_end_date_obj - timedelta(days=365)
+        # Daily cron runs often leave exactly one uncovered day; when that day
+        # is a weekend there are no trades to fetch, so skip the call entirely.
+        if fetch_start_date_obj == fetch_end_date_obj and fetch_end_date_obj.weekday() >= 5:
+            print(f"Only a weekend day to cover for account {current_account_id}. Skipping fetch.")
+            continue
 
-        print(f"Fetching incremental transactions from Schwab API for account {current_account_id} from {fetch_start_date_obj} to {fetch_end_date_obj}.")
-        response = client.get_transactions(current_account_id, start_date=fetch_start_date_obj, end_date=fetch_end_date_obj)
+        # Schwab API limit: date range must not be more than a year. Instead
+        # of clipping a wide back-fill to the most recent year, split it into
+        # consecutive one-year windows; each window becomes its own plan entry
+        # and runs concurrently in the thread pool below.
+        window_end = fetch_end_date_obj
+        while window_end >= fetch_start_date_obj:
+            window_start = max(fetch_start_date_obj, window_end - timedelta(days=365))
+            print(f"Fetching incremental transactions from Schwab API for account {current_account_id} from {window_start} to {window_end}.")
+            fetch_plan.append((current_account_id, window_start, window_end))
+            window_end = window_start - timedelta(days=1)
+
+    # Second pass: one blocking HTTP call per account, overlapped in a small
+    # thread pool so N accounts cost ~one round-trip; the shared client's
+    # connection pool is reused across workers. Responses are processed back
+    # on this thread in plan order so the output stays deterministic.
+    responses = []
+    if fetch_plan:
+        with ThreadPoolExecutor(max_workers=min(8, len(fetch_plan))) as executor:
+            responses = list(executor.map(
+                lambda plan: client.get_transactions(plan[0], start_date=plan[1], end_date=plan[2]),
+                fetch_plan))
+
+    for (current_account_id, _, _), response in zip(fetch_plan, responses):
         if not response.is_success:
             print(f"Error fetching transactions for account {current_account_id}:", response.text)
             continue # Move to the next account
@@ -213,7 +546,7 @@ def get_trade_history(start_date: str = None, end_date: str = None, account_id:
                 'symbol': symbol,
                 'quantity': quantity,
                 'price': price,
-                'trade_date': trade_date,
+                'trade_date': trade_date or '',
                 'net_amount': net_amount
             })
         newly_fetched_transactions.extend(processed_new_transactions_for_account)
@@ -221,13 +554,7 @@ def get_trade_history(start_date: str = None, end_date: str = None, account_id:
     # Combine existing cached transactions with newly fetched ones, avoiding duplicates
     # This assumes 'trade_date' and 'account_id' can uniquely identify a transaction for de-duplication
     # A more robust solution might involve a unique transaction ID from Schwab API if available
-    
-    # Create a set of existing transaction identifiers (e.g., tuple of (account_id, trade_date, symbol, quantity))
-    existing_transaction_ids = set()
-    for t in all_transactions:
-        if 'account_id' in t and 'trade_date' in t and 'symbol' in t and 'quantity' in t:
-            existing_transaction_ids.add((t['account_id'], t['trade_date'], t['symbol'], t['quantity']))
-
+    # (existing_transaction_ids was filled during the cache-load pass above)
     for new_t in newly_fetched_transactions:
         if 'account_id' in new_t and 'trade_date' in new_t and 'symbol' in new_t and 'quantity' in new_t:
             new_transaction_id = (new_t['account_id'], new_t['trade_date'], new_t['symbol'], new_t['quantity'])
@@ -239,11 +566,24 @@ def get_trade_history(start_date: str = None, end_date: str = None, account_id:
             print(f"Warning: Transaction missing critical fields for de-duplication: {new_t}")
             all_transactions.append(new_t)
 
-    # Sort all transactions by trade_date and then by account_id for consistent caching
-    all_transactions.sort(key=lambda x: (x.get('trade_date', ''), x.get('account_id', '')))
+    # Sort all transactions by trade_date and then by account_id for consistent
+    # caching. Keys were normalized above, so itemgetter runs in C with no
+    # per-comparison dict .get fallbacks; Timsort exploits the fact that the
+    # cached portion is already in order from the previous save.
+    all_transactions.sort(key=itemgetter('trade_date', 'account_id'))
 
-    with open(cache_file, 'w') as f:
-        json.dump(all_transactions, f, indent=4) # Use indent for readability
+    # Rewrite only the shards that gained transactions (all of them when
+    # migrating off the monolithic file). The global sort above means each
+    # shard comes out date-ordered too.
+    by_account = {}
+    for t in all_transactions:
+        by_account.setdefault(t['account_id'], []).append(t)
+    for aid, txns in by_account.items():
+        if migrating or len(txns) != loaded_counts.get(aid, 0):
+            shard_file = os.path.join(TRADE_HISTORY_DIR, f"{aid or '_unknown'}.json")
+            _write_cache_atomic(shard_file, txns)
+    if migrating:
+        os.remove(legacy_cache_file)
 
     return all_transactions
 
@@ -253,15 +593,19 @@ def get_long_term_holdings():
     NOTE: This is a simplified approach and does not implement full FIFO/LIFO accounting.
     It identifies buy transactions older than 1 year for currently held symbols.
     """
-    print("--- Debugging get_long_term_holdings ---")
-    transactions = get_trade_history(account_id=None) # Get all transactions
-    print("Transactions for long-term holdings:", transactions)
-    current_positions = get_positions() # Get current positions to filter relevant symbols
-    print("Current positions for long-term holdings:", current_positions)
+    # Trades and positions come from independent endpoints, so the two
+    # fetches overlap in a small pool instead of running back to back.
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        transactions_future = executor.submit(get_trade_history, account_id=None)
+        positions_future = executor.submit(get_positions)
+        transactions = transactions_future.result()
+        current_positions = positions_future.result()
+    if _logger.isEnabledFor(logging.DEBUG):
+        _logger.debug("Transactions for long-term holdings: %s", transactions)
+        _logger.debug("Current positions for long-term holdings: %s", current_positions)
 
     long_term_holdings = {}
     one_year_ago = datetime.now() - timedelta(days=365)
-    print("One year ago:", one_year_ago.date())
 
     # Create a dictionary to track current holdings by symbol and account
     current_holdings_by_symbol_account = {}
@@ -271,42 +615,28 @@ def get_long_term_holdings():
         if symbol not in current_holdings_by_symbol_account:
             current_holdings_by_symbol_account[symbol] = {}
         current_holdings_by_symbol_account[symbol][account_id] = p['quantity']
-    print("Current holdings by symbol and account:", current_holdings_by_symbol_account)
-
-    # Filter transactions for 'TRADE' type and process them
-    for t in transactions:
-        transaction_type = t.get('type')
-        symbol = t.get('symbol')
-        quantity = t.get('quantity')
-        trade_date_str = t.get('tradeDate')
-        net_amount = t.get('netAmount') # Use net_amount to determine buy/sell direction
-
-        if transaction_type != 'TRADE' or not symbol or quantity is None or not trade_date_str or net_amount is None:
-            continue # Skip non-trade transactions or incomplete data
-
-        try:
-            trade_date = datetime.strptime(trade_date_str.split('T')[0], '%Y-%m-%d').date()
-        except ValueError:
-            print(f"Error parsing trade date '{trade_date_str}' for transaction: {t}")
-            continue
 
-        # Determine if it's a buy or sell based on net_amount
-        # Positive net_amount usually indicates a buy (cash out of account)
-        # Negative net_amount usually indicates a sell (cash into account)
-        # Note: This might need refinement based on actual Schwab API transaction data specifics.
-        is_buy = net_amount < 0 # Assuming negative net_amount for buy (cash outflow)
-        is_sell = net_amount > 0 # Assuming positive net_amount for sell (cash inflow)
-
-        # For long-term holdings, we are interested in shares bought more than a year ago
-        # and still held. This simplified logic aggregates quantities.
-        if is_buy and trade_date < one_year_ago.date():
-            # Add to long-term holdings if it's a long-term buy
-            long_term_holdings[symbol] = long_term_holdings.get(symbol, 0) + abs(quantity)
-        elif is_sell:
-            # Deduct from long-term holdings if it's a sell
-            # Ensure we don't go below zero for long-term quantity
-            current_long_term_qty = long_term_holdings.get(symbol, 0)
-            long_term_holdings[symbol] = max(0, current_long_term_qty - abs(quantity))
+    # Replay the trades in one vectorized pass: buys older than a year add
+    # their quantity, sells subtract theirs, all aggregated per symbol with a
+    # groupby instead of a per-transaction Python loop with strptime calls.
+    # Positive net_amount indicates a sell (cash in), negative a buy (cash
+    # out), matching the old per-row logic; the floor at zero now applies to
+    # the per-symbol net rather than after each individual sell.
+    df = pd.DataFrame(transactions)
+    required = {'type', 'symbol', 'quantity', 'trade_date', 'net_amount'}
+    if not df.empty and required.issubset(df.columns):
+        df = df[df['type'] == 'TRADE'].dropna(subset=['symbol', 'quantity', 'trade_date', 'net_amount'])
+        trade_dates = pd.to_datetime(df['trade_date'].str.slice(0, 10),
+                                     format='%Y-%m-%d', errors='coerce')
+        df = df[trade_dates.notna()]
+        trade_dates = trade_dates.dropna()
+
+        quantities = df['quantity'].abs()
+        long_term_buys = quantities.where(
+            (df['net_amount'] < 0) & (trade_dates < one_year_ago), 0)
+        sells = quantities.where(df['net_amount'] > 0, 0)
+        net = (long_term_buys - sells).groupby(df['symbol']).sum().clip(lower=0)
+        long_term_holdings = net[net > 0].to_dict()
 
     # After processing all trades, filter out symbols that are no longer held or have zero long-term quantity
     # And ensure that the calculated long-term quantity does not exceed the currently held quantity
@@ -316,5 +646,5 @@ def get_long_term_holdings():
         if lt_quantity > 0 and current_total_held_quantity > 0:
             # The long-term quantity should not exceed the total currently held quantity for that symbol
             final_long_term_holdings[symbol] = min(lt_quantity, current_total_held_quantity)
-    
-    long_term_holdings = final_long_term_holdings
+
+    return final_long_term_holdings
@@ -2,16 +2,44 @@ import os
 
 WATCHLIST_FILE = 'watchlist.txt'
 
+# Parsed watchlist memo keyed by the file's mtime: dashboard renders call
+# read_watchlist several times per page, and the mtime check turns every
+# repeat call into a single stat instead of an open/read/parse. External
+# edits bump the mtime and invalidate the memo immediately.
+_WL_CACHE = {'mtime': None, 'symbols': None}
+
 def read_watchlist():
-    """Reads stock symbols from the watchlist file."""
+    """Reads stock symbols from the watchlist file.
+
+    The parsed list is memoized against the file's mtime, so repeat calls
+    only stat the file. On a miss the whole file is read in one call and
+    split with splitlines, rather than iterating the file object line by
+    line. Callers get a fresh copy each time — several mutate the returned
+    list in place, which must not reach the shared memo.
+    """
     if not os.path.exists(WATCHLIST_FILE):
         return []
+    mtime = os.path.getmtime(WATCHLIST_FILE)
+    if _WL_CACHE['mtime'] == mtime:
+        return list(_WL_CACHE['symbols'])
     with open(WATCHLIST_FILE, 'r') as f:
-        symbols = [line.strip().upper() for line in f if line.strip()]
-    return symbols
+        data = f.read()
+    symbols = [s.strip().upper() for s in data.splitlines() if s.strip()]
+    _WL_CACHE['mtime'] = mtime
+    _WL_CACHE['symbols'] = symbols
+    return list(symbols)
+
+def read_watchlist_set():
+    """Returns the watchlist symbols as a frozenset for O(1) membership tests."""
+    return frozenset(read_watchlist())
 
 def write_watchlist(symbols):
-    """Writes stock symbols to the watchlist file."""
+    """Writes stock symbols to the watchlist file in a single write call.
+
+    The memo is refreshed in place so the next read_watchlist call is served
+    from memory without re-reading the file just written.
+    """
     with open(WATCHLIST_FILE, 'w') as f:
-        for symbol in symbols:
-            f.write(f"{symbol}\n")
+        f.write('\n'.join(symbols) + '\n' if symbols else '')
+    _WL_CACHE['mtime'] = os.path.getmtime(WATCHLIST_FILE)
+    _WL_CACHE['symbols'] = [s.strip().upper() for s in symbols if s.strip()]